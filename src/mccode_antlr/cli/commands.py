@@ -1,4 +1,5 @@
 from mccode_antlr import Flavor
+from mccode_antlr.grammar.mccode_parse import pause_gc_while_parsing
 
 
 def mccode_script_parse(prog: str):
@@ -73,9 +74,11 @@ def mccode(flavor: Flavor):
     visitor.save(filename=config['output'])
 
 
+@pause_gc_while_parsing()
 def mcstas():
     mccode(Flavor.MCSTAS)
 
 
+@pause_gc_while_parsing()
 def mcxtrace():
     mccode(Flavor.MCXTRACE)
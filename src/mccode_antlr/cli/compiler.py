@@ -130,9 +130,13 @@ def mccode_compile_cmd(flavor, prog: str | None = None):
 
 def mcstas_compile():
     from mccode_antlr import Flavor
-    mccode_compile_cmd(Flavor.MCSTAS, prog='mcc-antlr')
+    from mccode_antlr.grammar.mccode_parse import pause_gc_while_parsing
+    with pause_gc_while_parsing():
+        mccode_compile_cmd(Flavor.MCSTAS, prog='mcc-antlr')
 
 
 def mcxtrace_compile():
     from mccode_antlr import Flavor
-    mccode_compile_cmd(Flavor.MCXTRACE, prog='mxc-antlr')
+    from mccode_antlr.grammar.mccode_parse import pause_gc_while_parsing
+    with pause_gc_while_parsing():
+        mccode_compile_cmd(Flavor.MCXTRACE, prog='mxc-antlr')
@@ -23,12 +23,30 @@ Usage examples::
 
     # Use a named clang-format style for C blocks
     mcfmt --clang-format-style LLVM instrument.instr
+
+    # Check many files using four worker processes
+    mcfmt --check -j 4 *.instr *.comp
 """
 from __future__ import annotations
 
 import sys
+from functools import cache
 from pathlib import Path
 
+from mccode_antlr.grammar.mccode_parse import pause_gc_while_parsing
+
+
+def _job_count(value: str) -> int:
+    """Parse ``-j/--jobs``, which must be a non-negative integer."""
+    from argparse import ArgumentTypeError
+    try:
+        jobs = int(value)
+    except ValueError:
+        jobs = -1
+    if jobs < 0:
+        raise ArgumentTypeError(f'must be 0 or a positive integer, not {value!r}')
+    return jobs
+
 
 def _build_parser():
     from argparse import ArgumentParser
@@ -102,9 +120,43 @@ def _build_parser():
             '(e.g. "LLVM", "Google", or an inline "{BasedOnStyle: …}" map).'
         ),
     )
+    parser.add_argument(
+        '-j', '--jobs',
+        type=_job_count,
+        default=1,
+        metavar='N',
+        help='Number of parallel worker processes (default: 1; 0 uses os.cpu_count())',
+    )
     return parser
 
 
+def _format_path(path: Path, clang_format) -> tuple[str, str | None, str | None]:
+    """Read and format one file, returning ``(original, formatted, error)``."""
+    from mccode_antlr.format import format_file
+    original = path.read_text(encoding='utf-8')
+    try:
+        return original, format_file(path, clang_format=clang_format), None
+    except Exception as exc:
+        return original, None, str(exc)
+
+
+@cache
+def _worker_clang_formatter(clang_options: tuple):
+    from mccode_antlr.format import make_clang_formatter
+    return make_clang_formatter(**dict(clang_options))
+
+
+def _format_one(path_str: str, clang_options: tuple | None) -> tuple[str, str | None, str | None]:
+    """Format one file in a worker process.
+
+    Module-level so it is picklable by ``ProcessPoolExecutor``.  The
+    clang-format callable is a closure, so each worker rebuilds its own from
+    the ``make_clang_formatter`` keyword arguments in *clang_options*.
+    """
+    clang_format = None if clang_options is None else _worker_clang_formatter(clang_options)
+    return _format_path(Path(path_str), clang_format)
+
+
 def _unified_diff(original: str, formatted: str, filename: str) -> str:
     import difflib
     return ''.join(
@@ -117,29 +169,29 @@ def _unified_diff(original: str, formatted: str, filename: str) -> str:
     )
 
 
+@pause_gc_while_parsing()
 def mcfmt():
     """Entry point for the ``mcfmt`` command-line tool."""
-    from mccode_antlr.format import format_file, make_clang_formatter
+    import os
+    from mccode_antlr.format import make_clang_formatter
 
     parser = _build_parser()
     args = parser.parse_args()
 
     # Build the clang-format callable (may be None if not requested / unavailable)
-    clang_format = None
+    clang_options = None
     if args.clang_format:
-        clang_format = make_clang_formatter(fetch_mccode_config=True)
+        clang_options = dict(fetch_mccode_config=True)
     elif args.clang_format_config:
-        clang_format = make_clang_formatter(
-            config=args.clang_format_config, fetch_mccode_config=False,
-        )
+        clang_options = dict(config=args.clang_format_config, fetch_mccode_config=False)
     elif args.clang_format_style:
-        clang_format = make_clang_formatter(
-            style=args.clang_format_style, fetch_mccode_config=False,
-        )
+        clang_options = dict(style=args.clang_format_style, fetch_mccode_config=False)
+    clang_format = None if clang_options is None else make_clang_formatter(**clang_options)
 
     any_changed = False
     exit_code = 0
 
+    paths = []
     for path in args.files:
         if not path.exists():
             print(f'mcfmt: {path}: No such file', file=sys.stderr)
@@ -154,12 +206,22 @@ def mcfmt():
                 file=sys.stderr,
             )
             continue
-
-        original = path.read_text(encoding='utf-8')
-        try:
-            formatted = format_file(path, clang_format=clang_format)
-        except Exception as exc:
-            print(f'mcfmt: {path}: error during formatting: {exc}', file=sys.stderr)
+        paths.append(path)
+
+    jobs = args.jobs or os.cpu_count() or 1
+    if jobs == 1 or len(paths) < 2:
+        results = (_format_path(path, clang_format) for path in paths)
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        # workers only rebuild a formatter if one could be made here, which also fetched any config
+        worker_options = None if clang_format is None else tuple(clang_options.items())
+        with ProcessPoolExecutor(max_workers=min(jobs, len(paths))) as pool:
+            results = list(pool.map(_format_one, [str(p) for p in paths], [worker_options] * len(paths)))
+
+    # results are reported in command-line order, as in the serial case
+    for path, (original, formatted, error) in zip(paths, results):
+        if error is not None:
+            print(f'mcfmt: {path}: error during formatting: {error}', file=sys.stderr)
             exit_code = 1
             continue
 
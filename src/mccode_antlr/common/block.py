@@ -1,10 +1,19 @@
 from __future__ import annotations
 
+import re
 from typing import Optional
 from msgspec import Struct
 from .utilities import escape_str_for_c
 
-class RawC(Struct):
+_IDENTIFIER_RE = re.compile(r'\b[A-Za-z_]\w*')
+
+
+class RawC(Struct, dict=True):
+    """A block of C source code, with the file and line it came from
+
+    Instances carry a ``__dict__`` for derived data cached outside the struct
+    fields (e.g., :attr:`identifiers`); it is never serialised, compared or copied.
+    """
     filename: Optional[str]
     line: int
     source: str
@@ -55,6 +64,19 @@ class RawC(Struct):
     def __contains__(self, value):
         return value in self.source
 
+    @property
+    def identifiers(self) -> frozenset[str]:
+        """Every identifier-like word in the source, including C keywords and words in comments or strings
+
+        Built once and reused until ``source`` is replaced.
+        """
+        cached = self.__dict__.get('_identifiers')
+        if cached is not None and cached[0] is self.source:
+            return cached[1]
+        identifiers = frozenset(_IDENTIFIER_RE.findall(self.source))
+        self._identifiers = self.source, identifiers
+        return identifiers
+
 
 def blocks_to_raw_c(*args):
     raw_c = [x if isinstance(x, RawC) else RawC.from_tuple(x) for x in args]
@@ -273,6 +273,14 @@ class Expr(msgspec.Struct, dict=True, eq=False):
                 return True
         return False
 
+    def symbol_names(self) -> set[str]:
+        """The names of all symbols in this expression; ``name in self`` is ``name in self.symbol_names()``"""
+        names = set()
+        for e in self._exprs:
+            if hasattr(e, 'free_symbols'):
+                names.update(s.name for s in e.free_symbols)
+        return names
+
     # ------------------------------------------------------------------
     # Properties
     # ------------------------------------------------------------------
@@ -7,11 +7,14 @@ from ..common import ComponentParameter, MetaData, parameter_name_present, RawC,
 
 
 # Could this be replaced by a subclassed 'name' class? E.g., Slit.comp <=> class McCompSlit(McComp)?
-class Comp(Struct):
+class Comp(Struct, dict=True):
     """Intermediate representation of a McCode component definition
 
     Read from a .comp file
     For output to a runtime source file
+
+    Instances carry a ``__dict__`` for derived data cached outside the struct
+    fields (e.g., :attr:`parameters_by_name`); it is never serialised, compared or copied.
     """
     name: Optional[str] = None           # Component *type* name, e.g. {name}.comp
     category: Optional[str] = None       # Component type catagory -- nearly free-form
@@ -73,15 +76,38 @@ class Comp(Struct):
     def __hash__(self):
         return hash(self.name)
 
+    @property
+    def parameters_by_name(self) -> dict[str, ComponentParameter]:
+        """Map each DEFINE and SETTING parameter name to its first definition.
+
+        Built once and reused until ``define`` or ``setting`` is replaced, or until a lookup
+        finds a parameter renamed in place; treat it as read-only.
+        """
+        cached = self.__dict__.get('_parameters_by_name')
+        if cached is not None and cached[0] is self.define and cached[1] is self.setting:
+            return cached[2]
+        by_name = {}
+        for par in (*self.define, *self.setting):
+            by_name.setdefault(par.name, par)
+        self._parameters_by_name = self.define, self.setting, by_name
+        return by_name
+
+    def _parameter_named(self, name: str) -> ComponentParameter | None:
+        """The first DEFINE or SETTING parameter named ``name``, or None if there is no such parameter."""
+        # A hit is confirmed against the parameter itself, so one renamed in place
+        # rebuilds the map the next time its old name is looked up
+        par = self.parameters_by_name.get(name)
+        if par is not None and par.name != name:
+            del self.__dict__['_parameters_by_name']
+            par = self.parameters_by_name.get(name)
+        return par
+
     def has_parameter(self, name: str):
-        return parameter_name_present(self.define, name) or parameter_name_present(self.setting, name)
+        return self._parameter_named(name) is not None
 
     def get_parameter(self, name: str, default=None):
-        if parameter_name_present(self.define, name):
-            return [par for par in self.define if par.name == name][0]
-        if parameter_name_present(self.setting, name):
-            return [par for par in self.setting if par.name == name][0]
-        return default
+        par = self._parameter_named(name)
+        return default if par is None else par
 
     def compatible_parameter_value(self, name: str, value):
         return self.get_parameter(name).compatible_value(value)
@@ -141,7 +167,7 @@ class Comp(Struct):
         self.display += blocks_to_raw_c(*blocks)
 
     def add_metadata(self, m: MetaData):
-        if any([x.name == m.name for x in self.metadata]):
+        if any(x.name == m.name for x in self.metadata):
             self.metadata = tuple([x for x in self.metadata if x.name != m.name])
         self.metadata += (m, )
 
@@ -3,13 +3,14 @@ from http.client import UnimplementedFileMode
 from loguru import logger
 
 from ..grammar import McCompParser as Parser, McCompVisitor
+from ..grammar.dispatch import DispatchVisitor
 from .comp import Comp
 from ..common import ComponentParameter, Expr, MetaData
 from ..common.visitor import add_common_visitors
 from ..grammar.McCompParser import McCompParser
 
 
-class CompVisitor(McCompVisitor):
+class CompVisitor(DispatchVisitor, McCompVisitor):
     def __init__(self, parent, filename):
         self.parent = parent  # the instrument (handler?) that wanted to read this component
         self.filename = filename
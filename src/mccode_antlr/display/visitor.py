@@ -31,6 +31,7 @@ from typing import Union
 from loguru import logger
 
 from ..grammar import CParser, CVisitor
+from ..grammar.dispatch import DispatchVisitor
 from ..common.expression import Expr
 
 from .primitives import (
@@ -275,7 +276,7 @@ def _build_primitive(name: str, args: list, local_vars: dict[str, Expr]) -> Prim
 # Visitor
 # ---------------------------------------------------------------------------
 
-class DisplayVisitor(CVisitor):
+class DisplayVisitor(DispatchVisitor, CVisitor):
     """CVisitor subclass that extracts display primitives from a MCDISPLAY body."""
 
     def __init__(self, local_vars: dict[str, Expr] | None = None):
@@ -434,10 +435,11 @@ def parse_display_source(
     """
     from antlr4 import InputStream, CommonTokenStream
     from ..grammar import CLexer
+    from ..grammar.mccode_parse import intern_identifiers
 
     wrapped = f'void __display__(void) {{\n{source}\n}}'
     stream = InputStream(wrapped)
-    lexer = CLexer(stream)
+    lexer = intern_identifiers(CLexer(stream))
     lexer.removeErrorListeners()
     tokens = CommonTokenStream(lexer)
     parser = CParser(tokens)
@@ -889,10 +889,16 @@ def make_clang_formatter(
             cmd.append(f'--style=file:{resolved_config}')
         # else: no --style flag → clang-format searches for .clang-format upward
         try:
+            # Exchange raw bytes with clang-format and decode its output once,
+            # rather than routing large blocks through text-mode pipe wrappers;
+            # line endings are normalised as text mode's universal newlines would.
             result = subprocess.run(
-                cmd, input=content, capture_output=True, text=True, check=True,
+                cmd, input=content.encode('utf-8'), capture_output=True, check=True,
             )
-            return result.stdout
+            output = result.stdout.decode('utf-8')
+            if '\r' in output:
+                output = output.replace('\r\n', '\n').replace('\r', '\n')
+            return output
         except subprocess.CalledProcessError as exc:
             from loguru import logger
             logger.warning(f'clang-format exited with code {exc.returncode}; '
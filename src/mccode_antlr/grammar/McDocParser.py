@@ -1,12 +1,8 @@
 # Generated from /home/g/Code/mccode-tidy/src/grammar/McDoc.g4 by ANTLR 4.13.2
 # encoding: utf-8
 from antlr4 import *
-from io import StringIO
 import sys
-if sys.version_info[1] > 5:
-	from typing import TextIO
-else:
-	from typing.io import TextIO
+from typing import TextIO
 
 def serializedATN():
     return [
@@ -1,9 +1,6 @@
 # Generated from /home/g/Code/mccode-tidy/src/grammar/McDoc.g4 by ANTLR 4.13.2
 from antlr4 import *
-if "." in __name__:
-    from .McDocParser import McDocParser
-else:
-    from McDocParser import McDocParser
+from .McDocParser import McDocParser
 
 # This class defines a complete generic visitor for a parse tree produced by McDocParser.
 
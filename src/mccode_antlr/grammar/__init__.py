@@ -1,3 +1,7 @@
+import sys
+from types import ModuleType
+
+
 def _import_mcdoc_language():
     from .mcdoc_parse import parse
     from .McDocVisitor import McDocVisitor
@@ -6,7 +10,6 @@ def _import_mcdoc_language():
 
 
 def _import_component_language():
-    # from .sa_mccomp import parse, SA_ErrorListener
     from .mccomp_parse import parse, ErrorListener
     from .McCompVisitor import McCompVisitor
     from .McCompParser import McCompParser
@@ -14,7 +17,6 @@ def _import_component_language():
 
 
 def _import_instrument_language():
-    # from .sa_mcinstr import parse, SA_ErrorListener
     from .mcinstr_parse import parse, ErrorListener
     from .McInstrVisitor import McInstrVisitor
     from .McInstrParser import McInstrParser
@@ -29,11 +31,43 @@ def _import_c_language():
     return CLexer, CParser, CListener, CVisitor
 
 
-# Import the classes defined in the language files
-McDoc_parse, McDocVisitor, McDocParser = _import_mcdoc_language()
-McComp_parse, McComp_ErrorListener, McCompVisitor, McCompParser = _import_component_language()
-McInstr_parse, McInstr_ErrorListener, McInstrVisitor, McInstrParser = _import_instrument_language()
-CLexer, CParser, CListener, CVisitor = _import_c_language()
+# The names each language import binds; a language is imported the first time one of its names is used
+_LANGUAGES = {
+    _import_mcdoc_language: ('McDoc_parse', 'McDocVisitor', 'McDocParser'),
+    _import_component_language: ('McComp_parse', 'McComp_ErrorListener', 'McCompVisitor', 'McCompParser'),
+    _import_instrument_language: ('McInstr_parse', 'McInstr_ErrorListener', 'McInstrVisitor', 'McInstrParser'),
+    _import_c_language: ('CLexer', 'CParser', 'CListener', 'CVisitor'),
+}
+_LAZY = {name: language for language, names in _LANGUAGES.items() for name in names}
+
+
+def __getattr__(name):
+    language = _LAZY.get(name)
+    if language is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals().update(zip(_LANGUAGES[language], language()))
+    return globals()[name]
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
+
+
+class _LazyGrammarModule(ModuleType):
+    """Keeps submodule imports from binding over the exported class of the same name.
+
+    Importing ``.McDocParser`` binds the *module* as this package's
+    ``McDocParser`` attribute, which would hide the ``McDocParser`` class that
+    :func:`__getattr__` provides.
+    """
+    def __setattr__(self, name, value):
+        if name in _LAZY and isinstance(value, ModuleType):
+            return
+        super().__setattr__(name, value)
+
+
+_module = sys.modules[__name__]
+_module.__class__ = _LazyGrammarModule
 
 # And set only their names to be exported:
 __all__ = [
@@ -0,0 +1,167 @@
+"""Table-driven dispatch for ANTLR parse-tree visitors.
+
+The ANTLR Python runtime dispatches every node through ``ctx.accept(visitor)``,
+which probes the visitor with ``hasattr`` before calling the bound ``visitX``
+method. :class:`DispatchVisitor` replaces that double-dispatch with a single
+dictionary lookup keyed on the context type, resolved once per visitor class.
+Generated ``visitX`` stubs which only delegate to ``visitChildren`` resolve to
+``visitChildren`` itself, saving a Python frame per unspecialised node.
+"""
+from __future__ import annotations
+
+from antlr4.tree.Tree import ErrorNodeImpl, ParseTreeVisitor, TerminalNodeImpl
+
+
+_aggregate_result = ParseTreeVisitor.aggregateResult
+_default_result = ParseTreeVisitor.defaultResult
+_should_visit_next_child = ParseTreeVisitor.shouldVisitNextChild
+
+
+def _children_stub(self, ctx):
+    return self.visitChildren(ctx)
+
+
+def _is_children_stub(function) -> bool:
+    """Whether ``function`` is a generated ``visitX`` which only returns ``self.visitChildren(ctx)``"""
+    code, stub = getattr(function, '__code__', None), _children_stub.__code__
+    return (code is not None and code.co_code == stub.co_code and code.co_names == stub.co_names
+            and code.co_argcount == stub.co_argcount)
+
+
+def _resolve_visit_method(visitor_class, context_type):
+    """Find the function that ``context_type.accept`` would call on a visitor.
+
+    Returns ``None`` if the context does not follow the generated
+    ``visitor.visitX(self)`` convention, in which case the caller must fall back
+    to ``accept``.
+    """
+    # hand-written subclasses of generated contexts inherit their accept
+    for klass in context_type.__mro__:
+        if (accept := klass.__dict__.get('accept')) is not None:
+            break
+    else:
+        return None
+    if klass is TerminalNodeImpl:
+        return visitor_class.visitTerminal
+    if klass is ErrorNodeImpl:
+        return visitor_class.visitErrorNode
+    name = klass.__name__
+    if not name.endswith('Context'):
+        return None
+    method = 'visit' + name[:-len('Context')]
+    if method not in getattr(accept, '__code__').co_consts:
+        return None
+    function = getattr(visitor_class, method, None)
+    if function is None or _is_children_stub(function):
+        # skip the stub's frame: all rule types without a specialised visitX share visitChildren
+        return visitor_class.visitChildren
+    return function
+
+
+class DispatchVisitor(ParseTreeVisitor):
+    """Mixin for generated visitors which caches ``visitX`` lookups per context type.
+
+    The table lives on the concrete visitor class and is filled the first time
+    each context type is visited, so methods attached after class creation
+    (e.g., by :func:`~mccode_antlr.common.visitor.add_common_visitors`) are found
+    as long as they are attached before the first visit.
+    """
+
+    @classmethod
+    def build_dispatch(cls) -> dict:
+        """Return the per-class ``{context_type: function}`` dispatch table."""
+        table = cls.__dict__.get('_visit_dispatch')
+        if table is None:
+            table = {}
+            cls._visit_dispatch = table
+        return table
+
+    def _visit_node(self, tree):
+        table = self.build_dispatch()
+        context_type = tree.__class__
+        try:
+            method = table[context_type]
+        except KeyError:
+            method = table[context_type] = _resolve_visit_method(type(self), context_type)
+        if method is None:
+            return tree.accept(self)
+        return method(self, tree)
+
+    def visit(self, tree):
+        return self._visit_node(tree)
+
+    def visitChildren(self, node):
+        """Visit the children of ``node``, walking unspecialised rules with an explicit stack.
+
+        Children whose rule resolves to this method are descended into in the
+        same loop rather than by a recursive call, each with its own partial
+        result which is aggregated into its parent's when its children are done,
+        exactly as the recursive form would.
+        """
+        result = self.defaultResult()
+        if not node.children:
+            return result
+        visitor_class = type(self)
+        if (visitor_class.aggregateResult is _aggregate_result and visitor_class.defaultResult is _default_result
+                and visitor_class.shouldVisitNextChild is _should_visit_next_child):
+            return self._visit_children_last(node)
+        inline = DispatchVisitor.visitChildren
+        table = self.build_dispatch()
+        stack = []
+        children = iter(node.children)
+        while True:
+            child = next(children, None)
+            if child is not None and not self.shouldVisitNextChild(node, result):
+                child = None
+            if child is None:
+                if not stack:
+                    return result
+                child_result = result
+                node, children, result = stack.pop()
+                result = self.aggregateResult(result, child_result)
+                continue
+            context_type = child.__class__
+            try:
+                method = table[context_type]
+            except KeyError:
+                method = table[context_type] = _resolve_visit_method(type(self), context_type)
+            if method is inline:
+                stack.append((node, children, result))
+                node, children, result = child, iter(child.children or ()), self.defaultResult()
+            elif method is None:
+                result = self.aggregateResult(result, child.accept(self))
+            else:
+                result = self.aggregateResult(result, method(self, child))
+
+    def _visit_children_last(self, node):
+        """:meth:`visitChildren` for the runtime's default result handling, which keeps the last child's result.
+
+        Every child is visited and the partial result of a node is only ever
+        replaced, so no ``aggregateResult`` or ``shouldVisitNextChild`` calls
+        are needed; a node without children contributes ``None``.
+        """
+        inline = DispatchVisitor.visitChildren
+        table = self.build_dispatch()
+        result = None
+        stack = []
+        children = iter(node.children)
+        while True:
+            child = next(children, None)
+            if child is None:
+                if not stack:
+                    return result
+                children = stack.pop()
+                continue
+            context_type = child.__class__
+            try:
+                method = table[context_type]
+            except KeyError:
+                method = table[context_type] = _resolve_visit_method(type(self), context_type)
+            if method is inline:
+                stack.append(children)
+                children = iter(child.children or ())
+                result = None
+            elif method is None:
+                result = child.accept(self)
+            else:
+                result = method(self, child)
@@ -1,9 +1,97 @@
 from __future__ import annotations
 
+import gc
+import sys
 import types
+from contextlib import contextmanager
+from functools import cache
 from antlr4 import InputStream, CommonTokenStream
+from antlr4.CommonTokenFactory import CommonTokenFactory
+from antlr4.Token import CommonToken
+from antlr4.atn.PredictionMode import PredictionMode
 from antlr4.tree.Tree import ParseTree
 from antlr4.error.ErrorListener import ErrorListener
+from antlr4.error.ErrorStrategy import BailErrorStrategy
+from antlr4.error.Errors import ParseCancellationException
+
+
+class InterningTokenFactory(CommonTokenFactory):
+    """Token factory which stores the interned text of selected token types.
+
+    The default factory leaves token text unset, so every ``str(ctx.Identifier())``
+    slices the input stream into a new string. Identifier names end up as keys of
+    parameter, component and variable dictionaries; interning them once here makes
+    repeated names share a single object and compare by identity.
+    """
+    __slots__ = ('interned',)
+
+    def __init__(self, interned: frozenset[int]):
+        super().__init__(copyText=False)
+        self.interned = interned
+
+    def create(self, source, type: int, text: str, channel: int, start: int, stop: int, line: int, column: int):
+        t = CommonToken(source, type, channel, start, stop)
+        t.line = line
+        t.column = column
+        if text is not None:
+            t.text = text
+        elif type in self.interned and source[1] is not None:
+            t.text = sys.intern(source[1].getText(start, stop))
+        return t
+
+
+@cache
+def _identifier_factory(identifier: int) -> InterningTokenFactory:
+    return InterningTokenFactory(frozenset((identifier,)))
+
+
+def intern_identifiers(lexer):
+    """Make ``lexer`` produce tokens with interned text for its ``Identifier`` token type, if it has one"""
+    identifier = getattr(lexer, 'Identifier', None)
+    if identifier is not None:
+        lexer._factory = _identifier_factory(identifier)
+    return lexer
+
+
+_pause_gc = False
+
+
+@contextmanager
+def pause_gc_while_parsing():
+    """Opt in to suspending the cyclic garbage collector during each parse in this block.
+
+    ``gc.disable()`` is process-global, so library callers keep the collector running
+    unless they ask otherwise; the command-line entry points, which own their process,
+    opt in. Usable as a context manager or a function decorator.
+    """
+    global _pause_gc
+    previous, _pause_gc = _pause_gc, True
+    try:
+        yield
+    finally:
+        _pause_gc = previous
+
+
+@contextmanager
+def paused_gc():
+    """Suspend the cyclic garbage collector while a parse tree is built, if opted in.
+
+    Every context links to its parent and children, so a parse allocates
+    thousands of container objects which all stay alive. Each allocation
+    threshold reached triggers a collection that traverses the growing tree
+    for nothing, so the collector only resumes once the tree is complete.
+    Only active within :func:`pause_gc_while_parsing`.
+    """
+    if not _pause_gc:
+        yield
+        return
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
 
 
 def parse(
@@ -13,18 +101,33 @@ def parse(
         entry_rule_name:str,
         error_listener: ErrorListener | None = None
 ) -> ParseTree:
-    lexer = lexer_class(stream)
+    lexer = intern_identifiers(lexer_class(stream))
     if error_listener is not None:
         lexer.removeErrorListeners()
         lexer.addErrorListener(error_listener)
     token_stream = CommonTokenStream(lexer)
 
     parser = parser_class(token_stream)
-    if error_listener is not None:
-        parser.removeErrorListeners()
-        parser.addErrorListener(error_listener)
-
     entry_rule_func = getattr(parser, entry_rule_name, None)
     if not isinstance(entry_rule_func, types.MethodType):
         raise ValueError("Invalid entry_rule_name '%s'" % entry_rule_name)
-    return entry_rule_func()
\ No newline at end of file
+
+    # Two-stage parsing: SLL prediction never falls back to full-context lookahead, and is exact for any
+    # input it parses without error. Only input on which SLL fails, which includes every syntax error,
+    # is parsed again with full LL prediction and the parser's usual error reporting and recovery.
+    listeners, error_handler = parser._listeners, parser._errHandler
+    parser.removeErrorListeners()
+    parser._errHandler = BailErrorStrategy()
+    parser._interp.predictionMode = PredictionMode.SLL
+    with paused_gc():
+        try:
+            return entry_rule_func()
+        except ParseCancellationException:
+            pass
+        parser._listeners, parser._errHandler = listeners, error_handler
+        if error_listener is not None:
+            parser.removeErrorListeners()
+            parser.addErrorListener(error_listener)
+        parser._interp.predictionMode = PredictionMode.LL
+        parser.reset()
+        return entry_rule_func()
\ No newline at end of file
@@ -3,6 +3,9 @@ from __future__ import annotations
 from antlr4 import InputStream
 from antlr4.tree.Tree import ParseTree
 from antlr4.error.ErrorListener import ErrorListener
+from .McCompLexer import McCompLexer
+from .McCompParser import McCompParser
+from .mccode_parse import parse as p
 
 
 def parse(
@@ -10,7 +13,4 @@ def parse(
         entry_rule_name: str,
         error_listener: ErrorListener | None = None
 ) -> ParseTree:
-    from .McCompParser import McCompParser
-    from .McCompLexer import McCompLexer
-    from .mccode_parse import parse as p
     return p(McCompLexer, McCompParser, stream, entry_rule_name, error_listener)
@@ -1,8 +1,582 @@
 from __future__ import annotations
 
-from antlr4 import InputStream
-from antlr4.tree.Tree import ParseTree
+import re
+from functools import cache
+from hashlib import sha256
+from typing import Iterator, NamedTuple
+from antlr4 import InputStream, CommonTokenStream, Token
+from antlr4.Token import CommonToken
+from antlr4.tree.Tree import ParseTree, TerminalNode, TerminalNodeImpl
 from antlr4.error.ErrorListener import ErrorListener
+from .McDocLexer import McDocLexer
+from .McDocParser import McDocParser, serializedATN
+from .mccode_parse import parse as p
+from ..config import config
+
+# The hand-written parser below hardcodes the ATN state and decision numbers of the
+# generated McDocParser; they are only valid for the ATN with this digest.
+_MCDOC_ATN_SHA256 = '42aa5fd296ece361c7a37e0e488d7e8c48cb42bf47a07d13db42b9d04f0131a6'
+_MCDOC_ATN_MATCHES = sha256(','.join(map(str, serializedATN())).encode()).hexdigest() == _MCDOC_ATN_SHA256
+
+
+def _fast_mcdoc_enabled() -> bool:
+    """The hand-written McDoc parser and predictions are used unless the ``fast_mcdoc``
+    configuration entry is false, e.g., from MCCODEANTLR_FAST_MCDOC=0 or a user config file
+
+    A regenerated McDocParser with a different ATN also disables them, since their
+    state numbers would no longer match.
+    """
+    return _MCDOC_ATN_MATCHES and bool(config['fast_mcdoc'].get())
+
+
+def _item(items: list, i: int | None):
+    """Mimic the generated ``X(i)`` accessors: all items for ``None``, else the i-th item or ``None``"""
+    if i is None:
+        return list(items)
+    return items[i] if 0 <= i < len(items) else None
+
+
+class LineContext(McDocParser.LineContext):
+    """The generated ``line`` context, holding on to its ``LINE`` and ``NEWLINE`` terminals as they are added"""
+    __slots__ = ('_line', '_newline')
+
+    def __init__(self, parser, parent=None, invokingState: int = -1):
+        self._line = self._newline = None
+        super().__init__(parser, parent, invokingState)
+
+    def addChild(self, child):
+        if isinstance(child, TerminalNode):
+            token_type = child.symbol.type
+            if token_type == McDocParser.LINE and self._line is None:
+                self._line = child
+            elif token_type == McDocParser.NEWLINE and self._newline is None:
+                self._newline = child
+        return super().addChild(child)
+
+    def LINE(self):
+        return self._line
+
+    def NEWLINE(self):
+        return self._newline
+
+
+class _SectionLines:
+    """Mixin for tagged section contexts which files ``line`` and ``NEWLINE`` children as they are added.
+
+    The generated ``line(i)`` and ``NEWLINE(i)`` accessors filter all children on
+    every call, so a visitor pass over a long section is quadratic in its length.
+    Concrete subclasses declare the ``_lines`` and ``_newlines`` slots, since
+    the slotted ANTLR context bases leave no room for them on the mixin.
+    """
+    __slots__ = ()
+
+    def __init__(self, parser, ctx):
+        self._lines = []
+        self._newlines = []
+        super().__init__(parser, ctx)
+
+    def copyFrom(self, ctx):
+        super().copyFrom(ctx)
+        # error nodes are copied directly into children, bypassing addChild
+        for child in self.children or ():
+            self._file(child)
+
+    def _file(self, child):
+        if isinstance(child, McDocParser.LineContext):
+            self._lines.append(child)
+        elif isinstance(child, TerminalNode) and child.symbol.type == McDocParser.NEWLINE:
+            self._newlines.append(child)
+
+    def addChild(self, child):
+        self._file(child)
+        return super().addChild(child)
+
+    def line(self, i: int | None = None):
+        return _item(self._lines, i)
+
+    def NEWLINE(self, i: int | None = None):
+        return _item(self._newlines, i)
+
+
+class InfoSectionContext(_SectionLines, McDocParser.InfoSectionContext):
+    __slots__ = ('_lines', '_newlines')
+
+
+class DescSectionContext(_SectionLines, McDocParser.DescSectionContext):
+    __slots__ = ('_lines', '_newlines')
+
+
+class ParamSectionContext(_SectionLines, McDocParser.ParamSectionContext):
+    __slots__ = ('_lines', '_newlines')
+
+
+class LinkSectionContext(_SectionLines, McDocParser.LinkSectionContext):
+    __slots__ = ('_lines', '_newlines')
+
+
+class OtherSectionContext(_SectionLines, McDocParser.OtherSectionContext):
+    __slots__ = ('_lines', '_newlines')
+
+
+class _Section(NamedTuple):
+    """A McDoc section with a tag followed by ``(line | NEWLINE)*``, with its generated-parser ATN states"""
+    context: type
+    alternative: int
+    decision: int
+    tag_state: int
+    loop_state: int
+    choice_state: int
+    line_state: int
+    newline_state: int
+    next_state: int
+
+
+@cache
+def _tagged_sections() -> dict[int, _Section]:
+    """The five structurally identical McDoc section rules, keyed by their tag token type"""
+    P = McDocParser
+    return {
+        P.INFO_TAG: _Section(InfoSectionContext, 1, 2, 14, 19, 17, 15, 16, 21),
+        P.DESC_TAG: _Section(DescSectionContext, 2, 4, 22, 27, 25, 23, 24, 29),
+        P.PARAM_TAG: _Section(ParamSectionContext, 3, 6, 30, 35, 33, 31, 32, 37),
+        P.LINK_TAG: _Section(LinkSectionContext, 4, 8, 38, 43, 41, 39, 40, 45),
+        P.OTHER_TAG: _Section(OtherSectionContext, 6, 10, 47, 52, 50, 48, 49, 54),
+    }
+
+
+@cache
+def _table_parser_class():
+    """A McDocParser whose loop decisions are predicted from a one-token lookup table.
+
+    The section bodies ``(line | NEWLINE)*`` are ambiguous with top-level
+    OrphanLine/BlankLine sections, which sends ANTLR's adaptivePredict into
+    full-context prediction over the remaining input at every loop iteration.
+    ANTLR resolves the ambiguity greedily, so the decisions are LL(1) and
+    their outcome depends only on the next token type.
+
+    The ``section`` rule is also replaced by one table-driven implementation of
+    the generated code, since the tagged alternatives differ only in their
+    context class and ATN state numbers, and ``mcdoc`` tests its loop condition
+    by set membership instead of rebuilding the generated bitmask test.  Its
+    ``line`` rule builds :class:`LineContext` nodes, as the hand-written scanner does.
+    The error strategy answers ``sync`` from precomputed per-state token sets
+    whenever the next token is one of them.  Tokens the rules have already
+    predicted are matched by :meth:`_fast_match`, which skips the generic
+    ``match``/``consume`` call chain.  Lines inside sections are built inline, without the
+    generated rule's entry, prediction and exit overhead.
+    """
+    from antlr4.atn.ParserATNSimulator import ParserATNSimulator
+    from antlr4.atn.ATNState import ATNState
+    from antlr4.error.ErrorStrategy import DefaultErrorStrategy
+    from antlr4.error.Errors import NoViableAltException, RecognitionException
+    LINE, NEWLINE, END_TAG = McDocParser.LINE, McDocParser.NEWLINE, McDocParser.END_TAG
+    continue_loop = {LINE: 1, NEWLINE: 1}
+    # decision number -> {next token type: alternative}; unlisted types exit with alternative 2
+    predictions = {2: continue_loop, 4: continue_loop, 6: continue_loop, 8: continue_loop,
+                   10: continue_loop, 12: {NEWLINE: 1}}
+    sections = _tagged_sections()
+    # every token type but EOF and the skipped WS starts a section, the generated `(1 << _la) & 510` test
+    section_first = frozenset((*sections, END_TAG, LINE, NEWLINE))
+
+    class TablePredictionSimulator(ParserATNSimulator):
+        def adaptivePredict(self, input, decision, outerContext):
+            table = predictions.get(decision)
+            if table is None:
+                return super().adaptivePredict(input, decision, outerContext)
+            return table.get(input.LA(1), 2)
+
+    # ATN state number -> token types which may follow it within its rule, as sync tests them
+    first_sets = {state.stateNumber: frozenset(McDocParser.atn.nextTokens(state)) for state in McDocParser.atn.states}
+
+    class LL1SyncStrategy(DefaultErrorStrategy):
+        """Skip the ATN lookups of ``sync`` when the next token is expected, as it is for valid input"""
+        def sync(self, recognizer):
+            if not self.errorRecoveryMode and recognizer._input.LA(1) in first_sets[recognizer.state]:
+                self.nextTokensContext = None
+                self.nextTokenState = ATNState.INVALID_STATE_NUMBER
+                return
+            super().sync(recognizer)
+
+    class McDocTableParser(McDocParser):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self._interp = TablePredictionSimulator(self, self.atn, self.decisionsToDFA, self.sharedContextCache)
+            self._errHandler = LL1SyncStrategy()
+
+        def _fast_match(self, ttype: int):
+            """``match`` without its call chain when ``ttype`` is next and no listener observes the parse"""
+            token = self._input.LT(1)
+            if token.type != ttype or ttype == Token.EOF or self._parseListeners or not self.buildParseTrees:
+                return self.match(ttype)
+            self._errHandler.reportMatch(self)
+            self._input.consume()
+            self._ctx.addTokenNode(token)
+            return token
+
+        def _section_body(self, section: _Section):
+            self.state = section.loop_state
+            self._errHandler.sync(self)
+            # The table continues the loop only for LINE or NEWLINE, the two tokens the body accepts,
+            # so the generated per-iteration NoViableAltException branch can not be reached
+            while self._interp.adaptivePredict(self._input, section.decision, self._ctx) == 1:
+                self.state = section.choice_state
+                self._errHandler.sync(self)
+                if self._input.LA(1) == LINE:
+                    self.state = section.line_state
+                    self._inline_line()
+                else:
+                    self.state = section.newline_state
+                    self._fast_match(NEWLINE)
+                self.state = section.next_state
+                self._errHandler.sync(self)
+
+        def _inline_line(self):
+            """The ``line`` rule for a predicted ``LINE``, without rule entry and exit bookkeeping"""
+            if self._parseListeners or not self.buildParseTrees:
+                return self.line()
+            parent, stream, handler = self._ctx, self._input, self._errHandler
+            localctx = LineContext(self, parent, self.state)
+            localctx.start = token = stream.LT(1)
+            parent.addChild(localctx)
+            handler.reportMatch(self)
+            stream.consume()
+            localctx._line = node = _terminal(token, localctx)
+            if (token := stream.LT(1)).type == NEWLINE:
+                handler.reportMatch(self)
+                stream.consume()
+                localctx._newline = newline = _terminal(token, localctx)
+                localctx.children = [node, newline]
+            else:
+                localctx.children = [node]
+            localctx.stop = stream.LT(-1)
+            return localctx
+
+        def line(self):
+            localctx = LineContext(self, self._ctx, self.state)
+            self.enterRule(localctx, 4, self.RULE_line)
+            try:
+                self.enterOuterAlt(localctx, 1)
+                self.state = 59
+                self._fast_match(LINE)
+                self.state = 61
+                self._errHandler.sync(self)
+                if self._interp.adaptivePredict(self._input, 12, self._ctx) == 1:
+                    self.state = 60
+                    self._fast_match(NEWLINE)
+            except RecognitionException as re:
+                localctx.exception = re
+                self._errHandler.reportError(self, re)
+                self._errHandler.recover(self, re)
+            finally:
+                self.exitRule()
+            return localctx
+
+        def mcdoc(self):
+            localctx = McDocParser.McdocContext(self, self._ctx, self.state)
+            self.enterRule(localctx, 0, self.RULE_mcdoc)
+            self._la = 0
+            try:
+                self.enterOuterAlt(localctx, 1)
+                self.state = 9
+                self._errHandler.sync(self)
+                while self._input.LA(1) in section_first:
+                    self.state = 6
+                    self.section()
+                    self.state = 11
+                    self._errHandler.sync(self)
+                self.state = 12
+                self.match(Token.EOF)
+            except RecognitionException as re:
+                localctx.exception = re
+                self._errHandler.reportError(self, re)
+                self._errHandler.recover(self, re)
+            finally:
+                self.exitRule()
+            return localctx
+
+        def section(self):
+            localctx = McDocParser.SectionContext(self, self._ctx, self.state)
+            self.enterRule(localctx, 2, self.RULE_section)
+            try:
+                self.state = 57
+                self._errHandler.sync(self)
+                token = self._input.LA(1)
+                if (section := sections.get(token)) is not None:
+                    localctx = section.context(self, localctx)
+                    self.enterOuterAlt(localctx, section.alternative)
+                    self.state = section.tag_state
+                    self._fast_match(token)
+                    self._section_body(section)
+                elif token == END_TAG:
+                    localctx = McDocParser.EndSectionContext(self, localctx)
+                    self.enterOuterAlt(localctx, 5)
+                    self.state = 46
+                    self._fast_match(END_TAG)
+                elif token == LINE:
+                    localctx = McDocParser.OrphanLineContext(self, localctx)
+                    self.enterOuterAlt(localctx, 7)
+                    self.state = 55
+                    self._inline_line()
+                elif token == NEWLINE:
+                    localctx = McDocParser.BlankLineContext(self, localctx)
+                    self.enterOuterAlt(localctx, 8)
+                    self.state = 56
+                    self._fast_match(NEWLINE)
+                else:
+                    raise NoViableAltException(self)
+            except RecognitionException as re:
+                localctx.exception = re
+                self._errHandler.reportError(self, re)
+                self._errHandler.recover(self, re)
+            finally:
+                self.exitRule()
+            return localctx
+
+    return McDocTableParser
+
+
+# TerminalNodeImpl routes every attribute assignment through a Python-level __setattr__
+_new_terminal = TerminalNodeImpl.__new__
+_set_terminal_parent = TerminalNodeImpl.parentCtx.__set__
+_set_terminal_symbol = TerminalNodeImpl.symbol.__set__
+
+
+def _terminal(token: Token, parent) -> TerminalNodeImpl:
+    """The terminal node ``parent.addTokenNode(token)`` would create, without adding it"""
+    node = _new_terminal(TerminalNodeImpl)
+    _set_terminal_symbol(node, token)
+    _set_terminal_parent(node, parent)
+    return node
+
+
+def _scan_mcdoc(parser, tokens: list[Token]):
+    """Build the ``mcdoc`` parse tree for a McDoc token list without ATN simulation.
+
+    The McDoc grammar is regular: every section is a tag token followed by a
+    greedy run of ``LINE NEWLINE?`` and ``NEWLINE`` tokens, so one pass over the
+    tokens suffices.  The produced tree uses the generated context classes and
+    matches what ``McDocParser.mcdoc()`` builds, including invoking states.
+    Each context's children, and a section's line and NEWLINE lists, are
+    assembled locally and assigned once rather than added one ``addChild`` at a time.
+    Returns ``None`` if an unexpected token type is encountered.
+    """
+    P = McDocParser
+    LINE, NEWLINE, EOF = P.LINE, P.NEWLINE, Token.EOF
+    tagged = _tagged_sections()
+
+    def line(parent, index, invoking_state):
+        ctx = LineContext(parser, parent, invoking_state)
+        ctx.start = token = tokens[index]
+        ctx._line = node = _terminal(token, ctx)
+        index += 1
+        if (token := tokens[index]).type == NEWLINE:
+            ctx._newline = newline = _terminal(token, ctx)
+            ctx.children = [node, newline]
+            index += 1
+        else:
+            ctx.children = [node]
+        ctx.stop = tokens[index - 1]
+        return ctx, index
+
+    root = P.McdocContext(parser)
+    root.start = tokens[0]
+    sections = []
+    index = 0
+    while (token := tokens[index]).type != EOF:
+        base = P.SectionContext(parser, root, 6)
+        base.start = token
+        token_type = token.type
+        if (section := tagged.get(token_type)) is not None:
+            ctx = section.context(parser, base)
+            children = [_terminal(token, ctx)]
+            lines, newlines, line_state = ctx._lines, ctx._newlines, section.line_state
+            index += 1
+            while (token_type := tokens[index].type) == LINE or token_type == NEWLINE:
+                if token_type == LINE:
+                    child, index = line(ctx, index, line_state)
+                    lines.append(child)
+                else:
+                    child = _terminal(tokens[index], ctx)
+                    newlines.append(child)
+                    index += 1
+                children.append(child)
+            ctx.children = children
+        elif token_type == LINE:
+            ctx = P.OrphanLineContext(parser, base)
+            child, index = line(ctx, index, 55)
+            ctx.children = [child]
+        elif token_type == NEWLINE or token_type == P.END_TAG:
+            ctx = (P.BlankLineContext if token_type == NEWLINE else P.EndSectionContext)(parser, base)
+            ctx.children = [_terminal(token, ctx)]
+            index += 1
+        else:
+            return None
+        ctx.stop = tokens[index - 1]
+        sections.append(ctx)
+    sections.append(_terminal(tokens[index], root))
+    root.children = sections
+    # Matching EOF does not advance the token stream, so the rule stops at the preceding token
+    root.stop = tokens[index - 1] if index else None
+    return root
+
+
+# One McDoc token per match: a '%' tag, a newline, or the rest of a content line
+_MCDOC_TOKEN = re.compile(r'%(?P<word>[A-Za-z]+)(?P<space>[ \t]*)(?P<newline>\r?\n)?|\r?\n|[^\r\n%][^\r\n]*')
+
+_END_WORDS = ('END', 'End', 'E')
+
+_TAG_WORDS = {
+    **dict.fromkeys(('I', 'ID', 'Identification', 'IDENTIFICATION'), McDocLexer.INFO_TAG),
+    **dict.fromkeys(('D', 'Description', 'DESCRIPTION'), McDocLexer.DESC_TAG),
+    **dict.fromkeys(('P', 'PAR', 'Parameters', 'PARAMETERS'), McDocLexer.PARAM_TAG),
+    **dict.fromkeys(('L', 'Link', 'Links', 'LINKS'), McDocLexer.LINK_TAG),
+    **dict.fromkeys(_END_WORDS, McDocLexer.END_TAG),
+}
+
+
+def _iter_spans(text: str) -> Iterator[tuple[int, int, int] | None]:
+    """Tokenize McDoc text with one compiled regular expression instead of the ANTLR lexer.
+
+    The McDoc lexer rules are simple enough that their longest-match behaviour
+    can be reproduced per token: a tag with a trailing newline takes the whole
+    ``%word`` (any word not naming a section is an ``OTHER_TAG``), while a tag
+    without one can only be the longest ``END_TAG`` spelling prefixing the word.
+    ``LINE`` starts with any character the other rules can not, so the skipped
+    ``WS`` rule never produces a token.  Yields ``(token type, start, stop)``
+    with an exclusive stop for every token ``McDocLexer`` would emit before EOF,
+    ending with ``None`` where the ANTLR lexer would report an error.
+    """
+    NEWLINE, LINE = McDocLexer.NEWLINE, McDocLexer.LINE
+    match = _MCDOC_TOKEN.match
+    start, end = 0, len(text)
+    while start < end:
+        if (m := match(text, start)) is None:
+            yield None
+            return
+        stop = m.end()
+        first = text[start]
+        if first == '%':
+            word = m.group('word')
+            if m.group('newline') is not None:
+                token_type = _TAG_WORDS.get(word, McDocLexer.OTHER_TAG)
+            elif word in _END_WORDS:
+                token_type = McDocLexer.END_TAG
+            else:
+                for prefix in _END_WORDS:
+                    if word.startswith(prefix):
+                        break
+                else:
+                    yield None
+                    return
+                token_type = McDocLexer.END_TAG
+                stop = start + 1 + len(prefix)
+        elif first == '\n' or first == '\r':
+            token_type = NEWLINE
+        else:
+            token_type = LINE
+        yield token_type, start, stop
+        start = stop
+
+
+def _lex_spans(text: str) -> list[tuple[int, int, int]] | None:
+    """All spans of :func:`_iter_spans`, or ``None`` if the text can not be lexed"""
+    spans = list(_iter_spans(text))
+    return None if spans and spans[-1] is None else spans
+
+
+def _lex_mcdoc(stream: InputStream) -> list[Token] | None:
+    """The tokens of :func:`_lex_spans` as ``CommonToken`` objects equal to those of ``McDocLexer``"""
+    text = stream.strdata
+    if (spans := _lex_spans(text)) is None:
+        return None
+    source = (McDocLexer(stream), stream)
+    LINE = McDocLexer.LINE
+    tokens = []
+    line, column = 1, 0
+    for token_type, start, stop in spans:
+        token = CommonToken(source, token_type, Token.DEFAULT_CHANNEL, start, stop - 1)
+        token.line, token.column, token.tokenIndex = line, column, len(tokens)
+        tokens.append(token)
+        if token_type == LINE or text[stop - 1] != '\n':
+            column += stop - start
+        else:
+            line, column = line + 1, 0
+    end = len(text)
+    eof = CommonToken(source, Token.EOF, Token.DEFAULT_CHANNEL, end, end - 1)
+    eof.line, eof.column, eof.tokenIndex = line, column, len(tokens)
+    tokens.append(eof)
+    return tokens
+
+
+def mcdoc_sections(text: str) -> Iterator[tuple[int, list[str]]]:
+    """Yield the tag token type and ``LINE`` texts of each tagged McDoc section, without a parse tree.
+
+    Consumers which only read section contents, like the McDoc extractors, need
+    none of the context objects that :func:`parse` builds for every section and
+    line. ``END_TAG``, orphan-line and blank-line sections carry no content and are
+    skipped.  Tokens are consumed as they are lexed, so only the section lines are
+    held; text the regular-expression tokenizer can not handle, or disabling the
+    fast path, goes through the parse tree instead with the same result.
+    """
+    sections = _tagged_sections()
+    if _fast_mcdoc_enabled():
+        LINE, NEWLINE = McDocLexer.LINE, McDocLexer.NEWLINE
+        found = []
+        lines = None
+        for span in _iter_spans(text):
+            if span is None:
+                break
+            token_type, start, stop = span
+            if token_type == LINE:
+                if lines is not None:
+                    lines.append(text[start:stop])
+            elif token_type != NEWLINE:
+                lines = None
+                if token_type in sections:
+                    lines = []
+                    found.append((token_type, lines))
+        else:
+            # nothing is yielded before the whole text is known to lex, as the fallback starts over
+            yield from found
+            return
+    for ctx in parse(InputStream(text), 'mcdoc').section():
+        if isinstance(tag := ctx.getChild(0), TerminalNode) and tag.symbol.type in sections:
+            yield tag.symbol.type, [line.LINE().getText() for line in ctx.line()]
+
+
+@cache
+def _tree_parser() -> McDocParser:
+    """The parser referenced by scanned McDoc trees.
+
+    Contexts only consult their parser for its rule names, e.g., in
+    ``toStringTree``; the scanner never runs it, so one instance without a
+    token stream is shared by all scanned trees.
+    """
+    return McDocParser(None)
+
+
+def _fast_parse(stream: InputStream, error_listener: ErrorListener | None = None) -> ParseTree:
+    if (tokens := _lex_mcdoc(stream)) is not None:
+        if (tree := _scan_mcdoc(_tree_parser(), tokens)) is not None:
+            return tree
+    lexer = McDocLexer(stream)
+    if error_listener is not None:
+        lexer.removeErrorListeners()
+        lexer.addErrorListener(error_listener)
+    token_stream = CommonTokenStream(lexer)
+    token_stream.fill()
+    parser = McDocParser(token_stream)
+    tokens = [t for t in token_stream.tokens if t.channel == Token.DEFAULT_CHANNEL]
+    tree = _scan_mcdoc(parser, tokens)
+    if tree is None:
+        # Defer to the generated rules for their error reporting and recovery
+        parser = _table_parser_class()(token_stream)
+        if error_listener is not None:
+            parser.removeErrorListeners()
+            parser.addErrorListener(error_listener)
+        token_stream.seek(0)
+        tree = parser.mcdoc()
+    return tree
 
 
 def parse(
@@ -10,7 +584,8 @@ def parse(
         entry_rule_name: str,
         error_listener: ErrorListener | None = None
 ) -> ParseTree:
-    from .McDocParser import McDocParser
-    from .McDocLexer import McDocLexer
-    from .mccode_parse import parse as p
-    return p(McDocLexer, McDocParser, stream, entry_rule_name, error_listener)
+    if not _fast_mcdoc_enabled():
+        return p(McDocLexer, McDocParser, stream, entry_rule_name, error_listener)
+    if entry_rule_name == 'mcdoc':
+        return _fast_parse(stream, error_listener)
+    return p(McDocLexer, _table_parser_class(), stream, entry_rule_name, error_listener)
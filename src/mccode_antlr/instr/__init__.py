@@ -13,6 +13,7 @@ from .flow import (
     WeightedRandomEdge,
     AnyFlowEdge,
     FlowEdgeRecord,
+    FlowEdgeView,
     build_particle_flow_graph,
     flow_graph_from_records,
     build_instance_io,
@@ -40,6 +41,7 @@ __all__ = [
     'WeightedRandomEdge',
     'AnyFlowEdge',
     'FlowEdgeRecord',
+    'FlowEdgeView',
     'build_particle_flow_graph',
     'flow_graph_from_records',
     'build_instance_io',
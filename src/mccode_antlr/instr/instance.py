@@ -1,12 +1,16 @@
 from __future__ import annotations
 
+import sys
+from io import StringIO
 from loguru import logger
 from typing import Optional
-from msgspec import Struct, field
+from msgspec import Struct, ValidationError, convert, field
+from msgspec.structs import fields, replace
 from typing import TypeVar, Union, Optional
 from ..comp import Comp
 from ..common import Expr
-from ..common import InstrumentParameter, ComponentParameter, MetaData, parameter_name_present, RawC, blocks_to_raw_c
+from ..common import InstrumentParameter, ComponentParameter, MetaData, RawC, blocks_to_raw_c
+from ..common import TextWrapper
 from .orientation import Vector, Angles
 from .jump import Jump
 
@@ -14,11 +18,14 @@ InstanceReference = TypeVar('InstanceReference', bound='Instance')
 VectorReference = tuple[Vector, Optional[InstanceReference]]
 AnglesReference = tuple[Angles, Optional[InstanceReference]]
 
-class Instance(Struct):
+class Instance(Struct, gc=False):
     """Intermediate representation of a McCode component instance
 
     Read from a .instr file TRACE section, using one or more .comp sources
     For output to a runtime source file
+
+    Instances only ever reference earlier instances (for relative positioning),
+    so they can not form reference cycles and are not tracked by the cyclic GC.
     """
     name: str
     type: Comp
@@ -34,15 +41,6 @@ class Instance(Struct):
     jump: tuple[Jump, ...] = field(default_factory=tuple)
     metadata: tuple[MetaData, ...] = field(default_factory=tuple)
 
-    def __eq__(self, other: Instance) -> bool:
-        if not isinstance(other, Instance):
-            return NotImplemented
-        from msgspec.structs import fields
-        for name in [field.name for field in fields(self)]:
-            if getattr(self, name) != getattr(other, name):
-                return False
-        return True
-
     def __hash__(self):
         def _ref_id(ref):
             return ref.name if ref is not None else None
@@ -59,13 +57,13 @@ class Instance(Struct):
 
     def to_file(self, output, wrapper=None, full=True):
         if self.cpu:
-            print(wrapper.line('CPU', []), file=output, end='')
+            output.write(wrapper.line('CPU', []))
 
-        instance_parameters = wrapper.hide(', '.join(p.to_string(wrapper=wrapper) for p in self.parameters))
-        line = wrapper.bold('COMPONENT') + f' {self.name} = {self.type.name}({instance_parameters}) '
+        instance_parameters = wrapper.hide(', '.join([p.to_string(wrapper=wrapper) for p in self.parameters]))
+        parts = [wrapper.bold('COMPONENT'), f' {self.name} = {self.type.name}({instance_parameters}) ']
 
         if self.when is not None:
-            line += wrapper.bold('WHEN') + ' ' + wrapper.escape(str(self.when)) + ' '
+            parts.extend((wrapper.bold('WHEN'), ' ', wrapper.escape(str(self.when)), ' '))
 
         def rf(which, x, required=False):
             absolute = wrapper.bold('ABSOLUTE')
@@ -73,67 +71,63 @@ class Instance(Struct):
             return _triplet_ref_str(wrapper.bold(which), x, absolute, relative, required)
 
         # The "AT ..." statement is required even when it is "AT (0, 0, 0) ABSOLUTE"
-        line += rf('AT', self.at_relative, required=True) + ' '
-        line += rf('ROTATED', self.rotate_relative) + wrapper.br()
-        print(line, file=output, end='')
+        parts.extend((rf('AT', self.at_relative, required=True), ' ', rf('ROTATED', self.rotate_relative), wrapper.br()))
+        output.write(''.join(parts))
 
         if not full:
             return  # Skip the rest of the output
 
         if self.group is not None:
-            print(wrapper.line('GROUP', [self.group]), file=output)
+            output.write(wrapper.line('GROUP', [self.group]) + '\n')
         if self.extend:
             extends = '\n'.join(str(ext) for ext in self.extend)
-            print(wrapper.block('EXTEND', extends), file=output)
+            output.write(wrapper.block('EXTEND', extends) + '\n')
         for jump in self.jump:
             jump.to_file(output, wrapper)
         for metadata in self.metadata:
             metadata.to_file(output, wrapper)
 
     def to_string(self, wrapper, full=True):
-        from io import StringIO
         output = StringIO()
         self.to_file(output, wrapper=wrapper, full=full)
         return output.getvalue()
 
     def __str__(self):
-        from mccode_antlr.common import TextWrapper
         return self.to_string(TextWrapper())
 
     def partial_str(self):
-        from mccode_antlr.common import TextWrapper
         return self.to_string(TextWrapper(), full=False)
 
     @classmethod
     def from_instance(cls, name: str, ref: InstanceReference, at: VectorReference, rotate: AnglesReference):
-        # from copy import deepcopy
-        # copy each of: parameters, extend, group, jump, when, metadata
+        # parameters, extend, jump and metadata are immutable tuples which are replaced, never modified,
+        # so the new instance can share them with its reference
         return cls(name, ref.type, at, rotate,
-                   parameters=tuple([par for par in ref.parameters]),
+                   parameters=ref.parameters,
                    when=ref.when, group=ref.group,
-                   extend=tuple([ext for ext in ref.extend]),
-                   jump=tuple([jmp for jmp in ref.jump]),
-                   metadata=tuple([md for md in ref.metadata]))
+                   extend=ref.extend,
+                   jump=ref.jump,
+                   metadata=ref.metadata)
 
     def __post_init__(self):
         if not self.type.acc:
             self.cpu = True
 
     def set_parameter(self, name: str, value, overwrite=False, allow_repeated=True):
-        if not parameter_name_present(self.type.define, name) and not parameter_name_present(self.type.setting, name):
+        p = self.type.get_parameter(name)
+        if p is None:
             raise RuntimeError(f"Unknown parameter {name} for component type {self.type.name}")
-        if parameter_name_present(self.parameters, name):
+        par = self._defined_parameter(name)
+        if par is not None:
             if overwrite:
                 self.parameters = tuple(x for x in self.parameters if name != x.name)
             elif allow_repeated:
-                par = [p for p in self.parameters if name == p.name][0]
                 logger.info(f'Multiple definitions of {name} in component instance {self.name}')
                 if par.value != value:
                     logger.info(f'  first-encountered value {par.value} retained')
                     logger.info(f'  newly-encountered value {value} dropped')
             else:
                 raise RuntimeError(f"Multiple definitions of {name} in component instance {self.name}")
-        p = self.type.get_parameter(name)
 
         if not p.compatible_value(value):
             logger.debug(f'{p=}, {name=}, {value=}')
@@ -172,15 +166,20 @@ class Instance(Struct):
         for par in self.parameters:
             par.value.verify_parameters(instrument_parameter_names)
 
-    def get_parameter(self, name: str):
+    def _defined_parameter(self, name: str):
+        """The first instance parameter with this name, or None -- a plain loop is cheaper than any()"""
         for par in self.parameters:
             if par.name == name:
                 return par
-        return self.type.get_parameter(name)
+        return None
+
+    def get_parameter(self, name: str):
+        par = self._defined_parameter(name)
+        return self.type.get_parameter(name) if par is None else par
 
     def defines_parameter(self, name: str):
         """Check whether this instance has defined the named parameter"""
-        return parameter_name_present(self.parameters, name)
+        return self._defined_parameter(name) is not None
 
     def set_parameters(self, **kwargs):
         for name, value in kwargs.items():
@@ -234,37 +233,49 @@ class Instance(Struct):
         return self
 
     def add_metadata(self, m: MetaData):
-        if any([x.name == m.name for x in self.metadata]):
+        if any(x.name == m.name for x in self.metadata):
             self.metadata = tuple([x for x in self.metadata if x.name != m.name])
         self.metadata += (m, )
 
     def collect_metadata(self):
         # A component declaration and instance can define metadata with the same name
         # When they do, the metadata from *the instance* should take precedence
+        if not self.metadata:
+            # Comp.add_metadata keeps the declaration's names unique, so there is nothing to merge
+            return self.type.collect_metadata()
         md = {m.name: m for m in self.type.collect_metadata()}
         md.update({m.name: m for m in self.metadata})
         return tuple(md.values())
 
     def copy(self):
-        return Instance(self.name, self.type, self.at_relative, self.rotate_relative,
-                        parameters=self.parameters,
-                        removable=self.removable, cpu=self.cpu, split=self.split, when=self.when,
-                        group=self.group, extend=self.extend, jump=self.jump, metadata=self.metadata)
+        return replace(self)
+
+    def referenced_names(self) -> frozenset[str]:
+        """The symbol names used by the parameter, position, SPLIT, WHEN and JUMP expressions of this instance
+
+        EXTEND blocks are raw C rather than expressions, so they are not included; see :attr:`RawC.identifiers`.
+        """
+        exprs = [par.value for par in self.parameters]
+        exprs.extend(self.at_relative[0])
+        exprs.extend(self.rotate_relative[0])
+        exprs.extend(x for x in (self.split, self.when) if x is not None)
+        exprs.extend(jump.condition for jump in self.jump)
+        names = set()
+        for expr in exprs:
+            names.update(expr.symbol_names())
+        return frozenset(names)
 
     def parameter_used(self, name: str):
-        if any([name in par.value for par in self.parameters]):
+        # A single query stops at the first use; use referenced_names() to check many names at once
+        if any(name in par.value for par in self.parameters):
             return True
         if name in self.at_relative[0] or name in self.rotate_relative[0]:
             return True
         if name in (self.split or []) or name in (self.when or []):
             return True
-        for block in self.extend:
-            if name in block:
-                return True
-        for jump in self.jump:
-            if name in jump:
-                return True
-        return False
+        if any(name in block for block in self.extend):
+            return True
+        return any(name in jump for jump in self.jump)
 
     @property
     def dependency(self):
@@ -281,8 +292,8 @@ def _triplet_ref_str(which, tr: Union[VectorReference, AnglesReference], absolut
 
 
 class DepInstance(Instance):
-    at_relative: tuple[Vector, str]
-    rotate_relative: tuple[Angles, str]
+    at_relative: tuple[Vector, Optional[str]]
+    rotate_relative: tuple[Angles, Optional[str]]
     type: str
 
     def __post_init__(self):
@@ -291,9 +302,7 @@ class DepInstance(Instance):
 
     @classmethod
     def from_independent(cls, independent: Instance):
-        from msgspec.structs import fields
-        to_copy = {k.name for k in fields(cls) if k.name != 'type'}
-        data = {k: getattr(independent, k) for k in to_copy}
+        data = {k: getattr(independent, k) for k in _SHARED_FIELD_NAMES}
         data['type'] = independent.type.name
 
         def a_b(w):
@@ -306,6 +315,20 @@ class DepInstance(Instance):
 
     @classmethod
     def from_dict(cls, args: dict):
+        """Build from a decoded dict; msgspec converts the whole instance natively,
+        with the field-by-field walk kept for older serialised formats it rejects"""
+        try:
+            inst = convert(args, type=cls)
+        except ValidationError:
+            return cls._from_legacy_dict(args)
+        # Match parsed instruments, whose identifier tokens are interned
+        inst.name = sys.intern(inst.name)
+        if inst.group is not None:
+            inst.group = sys.intern(inst.group)
+        return inst
+
+    @classmethod
+    def _from_legacy_dict(cls, args: dict):
         preq = 'name', 'type', 'removable', 'cpu',
         popt = 'group',
         tmreq = {'parameters': ComponentParameter, 'extend': RawC, 'jump': Jump,
@@ -313,6 +336,10 @@ class DepInstance(Instance):
         mopt = {'split': Expr, 'when': Expr}
         data = {k: args[k] for k in preq}
         data.update({k: args[k] for k in popt})
+        # Match parsed instruments, whose identifier tokens are interned
+        data['name'] = sys.intern(data['name'])
+        if data['group'] is not None:
+            data['group'] = sys.intern(data['group'])
         data.update({k: t.from_dict(args[k]) for k, t in mopt.items() if k in args and args[k]})
         data.update({k: tuple(t.from_dict(a) for a in args[k]) for k, t in tmreq.items()})
 
@@ -323,23 +350,26 @@ class DepInstance(Instance):
         data['at_relative'] = (vectors, ar_name)
         data['rotate_relative'] = angles, rr_name
         # Strip keys that belonged to old serialized formats (e.g. 'orientation')
-        from msgspec.structs import fields as struct_fields
-        known = {f.name for f in struct_fields(cls)}
-        data = {k: v for k, v in data.items() if k in known}
+        data = {k: v for k, v in data.items() if k in _FIELD_NAMES}
         return cls(**data)
 
     def make_independent(self, components: dict[str, Comp]):
-        from msgspec.structs import fields
-        data = {k.name: getattr(self, k.name) for k in fields(self)}
+        data = {k: getattr(self, k) for k in _SHARED_FIELD_NAMES}
         data['type'] = components[self.type]
         return Instance(**data)
 
+
+# Instance and DepInstance have the same fields; only the type of ``type`` differs (Comp vs name)
+_FIELD_NAMES = frozenset(f.name for f in fields(DepInstance))
+_SHARED_FIELD_NAMES = tuple(f.name for f in fields(DepInstance) if f.name != 'type')
+
+
 def make_independent(dependents: tuple[DepInstance, ...], components: dict[str, Comp]):
     independents = [d.make_independent(components) for d in dependents]
-    names = tuple(i.name for i in independents)
+    by_name = {i.name: i for i in independents}
     for d, t in zip(dependents, independents):
-        if d.at_relative[1] in names:
-            t.at_relative = t.at_relative[0], next(i for i in independents if i.name == d.at_relative[1])
-        if d.rotate_relative[1] in names:
-            t.rotate_relative = t.rotate_relative[0], next(i for i in independents if i.name == d.rotate_relative[1])
+        if d.at_relative[1] in by_name:
+            t.at_relative = t.at_relative[0], by_name[d.at_relative[1]]
+        if d.rotate_relative[1] in by_name:
+            t.rotate_relative = t.rotate_relative[0], by_name[d.rotate_relative[1]]
     return tuple(independents)
\ No newline at end of file
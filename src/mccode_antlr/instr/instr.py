@@ -1,22 +1,36 @@
 """Data structures required for representing the contents of a McCode instr file"""
 from __future__ import annotations
 
-from functools import lru_cache
+import re
 from io import StringIO
+from types import MappingProxyType
+from operator import attrgetter
 from msgspec import Struct, field
+from msgspec.structs import fields
 from typing import Optional
-from ..common import InstrumentParameter, MetaData, parameter_name_present, RawC, blocks_to_raw_c, Expr
+from ..common import InstrumentParameter, MetaData, RawC, blocks_to_raw_c, Expr
 from ..reader import Registry
 from .instance import Instance, DepInstance, Comp
 from .group import Group, DependentGroup
 from loguru import logger
 
+# Old-style keywords which may appear in DEPENDENCY strings, see Instr._replace_keywords
+_NEXUSFLAGS_RE = re.compile(r'@NEXUSFLAGS@')
+_MCCODE_LIB_RE = re.compile(r'@MCCODE_LIB@')
+_KEYWORD_RE = re.compile(r'@(\w+)@')
 
-class Instr(Struct):
+_get_name = attrgetter('name')
+_get_group = attrgetter('group')
+
+
+class Instr(Struct, dict=True):
     """Intermediate representation of a McCode instrument
 
     Read from a .instr file -- possibly including more .comp and .instr file sources
     For output to a runtime source file
+
+    Instances carry a ``__dict__`` for derived data cached outside the struct
+    fields (e.g., :attr:`flow_graph`); it is never serialised, compared or copied.
     """
     name: Optional[str] = None  # Instrument name, e.g. {name}.instr (typically)
     source: Optional[str] = None  # Instrument *file* name
@@ -37,7 +51,7 @@ class Instr(Struct):
     def from_dict(cls, args: dict):
         from mccode_antlr.reader.registry import SerializableRegistry as SR
         from mccode_antlr.instr.instance import make_independent
-        from mccode_antlr.instr.flow import FlowEdgeRecord
+        from mccode_antlr.instr.flow import flow_edges_from_builtins
         popt = 'name', 'source'
         tpreq = 'included', 'dependency',
         tmtype = {'parameters': InstrumentParameter, 'metadata': MetaData,
@@ -55,13 +69,12 @@ class Instr(Struct):
         instances = data.pop('instances')
         components = data.pop('components')
         data['components'] = make_independent(instances, components)
-        data['flow_edges'] = tuple(FlowEdgeRecord.from_dict(a) for a in args.get('flow_edges', []))
+        data['flow_edges'] = flow_edges_from_builtins(args.get('flow_edges', []))
         return cls(**data)
 
     def to_dict(self):
-        from msgspec.structs import fields
         from mccode_antlr.reader.registry import SerializableRegistry as SR
-        data = {k.name: getattr(self, k.name) for k in fields(self)}
+        data = {name: getattr(self, name) for name in _FIELD_NAMES}
         instances = tuple(DepInstance.from_independent(inst) for inst in self.components)
         components = {inst.type.name: inst.type for inst in self.components}
 
@@ -70,15 +83,6 @@ class Instr(Struct):
         data['components'] = components
         return data
 
-    def __eq__(self, other):
-        if not isinstance(other, Instr):
-            return NotImplemented
-        from msgspec.structs import fields
-        for name in [f.name for f in fields(self)]:
-            if getattr(self, name) != getattr(other, name):
-                return False
-        return True
-
     def __hash__(self):
         return hash((
             self.name, self.source, self.parameters, self.metadata, self.components,
@@ -92,42 +96,43 @@ class Instr(Struct):
         if wrapper is None:
             from mccode_antlr.common import TextWrapper
             wrapper = TextWrapper(width=120)
-        print(wrapper.start_block_comment(f'Instrument {self.name}'), file=output)
-        print(wrapper.line('Instrument:', [self.name or 'None']), file=output)
-        print(wrapper.line('Source:', [self.source or 'None']), file=output)
-        print(wrapper.line('Contains:', [f'"%include {include}"' for include in self.included]), file=output)
-        print(wrapper.line('Registries:', [registry.name for registry in self.registries]), file=output)
+        output.write(wrapper.start_block_comment(f'Instrument {self.name}') + '\n')
+        output.write(wrapper.line('Instrument:', [self.name or 'None']) + '\n')
+        output.write(wrapper.line('Source:', [self.source or 'None']) + '\n')
+        output.write(wrapper.line('Contains:', [f'"%include {include}"' for include in self.included]) + '\n')
+        output.write(wrapper.line('Registries:', [registry.name for registry in self.registries]) + '\n')
         for registry in self.registries:
             registry.to_file(output=output, wrapper=wrapper)
-        print(wrapper.end_block_comment(), file=output)
+        output.write(wrapper.end_block_comment() + '\n')
 
-        instr_parameters = wrapper.hide(', '.join(p.to_string(wrapper=wrapper) for p in self.parameters))
+        instr_parameters = wrapper.hide(', '.join([p.to_string(wrapper=wrapper) for p in self.parameters]))
         first_line = wrapper.line('DEFINE INSTRUMENT', [f'{self.name}({instr_parameters})'])
-        print(first_line, file=output)
+        output.write(first_line + '\n')
 
         for metadata in self.metadata:
             metadata.to_file(output=output, wrapper=wrapper)
         # Print only the .instr-added DEPENDENCY line(s) here -- .comp DEPENDENCY excluded
         if self.dependency:
-            print(wrapper.quoted_line('DEPENDENCY ', list(self.dependency)), file=output)
+            output.write(wrapper.quoted_line('DEPENDENCY ', list(self.dependency)) + '\n')
 
         if self.declare:
-            print(wrapper.block('DECLARE', _join_raw_tuple(self.declare)), file=output)
+            output.write(wrapper.block('DECLARE', _join_raw_tuple(self.declare)) + '\n')
         if self.user:
-            print(wrapper.block('USERVARS', _join_raw_tuple(self.user)), file=output)
+            output.write(wrapper.block('USERVARS', _join_raw_tuple(self.user)) + '\n')
         if self.initialize:
-            print(wrapper.block('INITIALIZE', _join_raw_tuple(self.initialize)), file=output)
+            output.write(wrapper.block('INITIALIZE', _join_raw_tuple(self.initialize)) + '\n')
 
-        print(wrapper.start_list('TRACE'), file=output)
+        output.write(wrapper.start_list('TRACE') + '\n')
+        start_item, end_item = wrapper.start_list_item() + '\n', wrapper.end_list_item() + '\n'
         for instance in self.components:
-            print(wrapper.start_list_item(), file=output)
+            output.write(start_item)
             instance.to_file(output, wrapper)
-            print(wrapper.end_list_item(), file=output)
+            output.write(end_item)
         if self.save:
-            print(wrapper.block('SAVE', _join_raw_tuple(self.save)), file=output)
+            output.write(wrapper.block('SAVE', _join_raw_tuple(self.save)) + '\n')
         if self.final:
-            print(wrapper.block('FINALLY', _join_raw_tuple(self.final)), file=output)
-        print(wrapper.end_list('END'), file=output)
+            output.write(wrapper.block('FINALLY', _join_raw_tuple(self.final)) + '\n')
+        output.write(wrapper.end_list('END') + '\n')
 
     def to_string(self, wrapper):
         from io import StringIO
@@ -147,11 +152,69 @@ class Instr(Struct):
         body = output.getvalue()
         return f'<div class="mccode-instr">{body}</div>'
 
+    @property
+    def name_to_idx(self) -> MappingProxyType[str, int]:
+        """A read-only map of each component instance name to its index in ``components``.
+
+        Built once and reused until ``components`` is replaced, or until a lookup finds
+        an instance renamed in place. It is a live view: :meth:`add_component` extends
+        the underlying map rather than rebuilding it.
+        """
+        return MappingProxyType(self._name_index())
+
+    def _name_index(self) -> dict[str, int]:
+        cached = self.__dict__.get('_name_to_idx')
+        if cached is not None and cached[0] is self.components:
+            return cached[1]
+        index = {inst.name: idx for idx, inst in enumerate(self.components)}
+        self._name_to_idx = self.components, index
+        return index
+
+    def _component_index(self, name: str) -> int | None:
+        """The index of the instance named ``name``, or None if there is no such instance."""
+        # A hit is confirmed against the instance itself, so one renamed in place
+        # rebuilds the index the next time its old name is looked up
+        idx = self._name_index().get(name)
+        if idx is not None and self.components[idx].name != name:
+            del self.__dict__['_name_to_idx']
+            idx = self._name_index().get(name)
+        return idx
+
+    @property
+    def parameters_by_name(self) -> dict[str, InstrumentParameter]:
+        """Map each instrument parameter name to its parameter.
+
+        Built once and reused until ``parameters`` is replaced, or until a lookup finds
+        a parameter renamed in place; treat it as read-only.
+        """
+        cached = self.__dict__.get('_parameters_by_name')
+        if cached is not None and cached[0] is self.parameters:
+            return cached[1]
+        by_name = {}
+        for par in self.parameters:
+            by_name.setdefault(par.name, par)
+        self._parameters_by_name = self.parameters, by_name
+        return by_name
+
+    def _parameter_named(self, name: str) -> InstrumentParameter | None:
+        """The first instrument parameter named ``name``, or None if there is no such parameter."""
+        # A hit is confirmed against the parameter itself, so one renamed in place
+        # rebuilds the map the next time its old name is looked up
+        par = self.parameters_by_name.get(name)
+        if par is not None and par.name != name:
+            del self.__dict__['_parameters_by_name']
+            par = self.parameters_by_name.get(name)
+        return par
+
     def add_component(self, a: Instance):
-        if any(x.name == a.name for x in self.components):
+        if self._component_index(a.name) is not None:
             raise RuntimeError(f"A component instance named {a.name} is already present in the instrument")
+        index = self._name_index()
         prev = self.components[-1] if self.components else None
         self.components += (a,)
+        # extend the name index in place, rather than rebuilding it on next use
+        index[a.name] = len(self.components) - 1
+        self._name_to_idx = self.components, index
         if prev is not None:
             self._add_sequential_or_group_edge(prev, a)
 
@@ -201,7 +264,7 @@ class Instr(Struct):
         from .flow import FlowEdgeRecord, JumpEdge
         components = self.components
         n = len(components)
-        name_to_idx = {inst.name: idx for idx, inst in enumerate(components)}
+        name_to_idx = self._name_index()
         for inst in components:
             for jmp in inst.jump:
                 target_idx = jmp.absolute_target
@@ -222,19 +285,49 @@ class Instr(Struct):
 
         This is idempotent; it replaces any existing ``flow_edges`` content.
         """
-        from .flow import _build_flow_edge_records, flow_graph_from_records
-        self.flow_edges = _build_flow_edge_records(self.components)
+        from .flow import flow_graph_from_records
+        self.flow_edges = self._component_flow_edges()
         return flow_graph_from_records(self.components, self.flow_edges)
 
+    def _component_flow_edges(self) -> tuple:
+        """The ``FlowEdgeRecord`` tuple derived from ``components``, reused until they are replaced or renamed."""
+        from .flow import _build_flow_edge_records
+        index = self._name_index()
+        cached = self.__dict__.get('_derived_flow_edges')
+        if cached is not None and cached[0] is self.components and cached[1] is index:
+            return cached[2]
+        records = _build_flow_edge_records(self.components, index)
+        self._derived_flow_edges = self.components, index, records
+        return records
+
     @property
     def flow_graph(self):
         """Derive a :class:`networkx.MultiDiGraph` from the current ``flow_edges`` (read-only view).
 
         Call :meth:`build_flow_graph` to (re)build ``flow_edges`` from the component list,
         or use :meth:`finalize_flow_edges` to add JUMP edges after incremental construction.
+
+        The graph is built once and reused until ``components`` or ``flow_edges`` is
+        replaced, which every method modifying either does, or an instance is renamed
+        in place.
+
+        Note:
+            The returned graph is shared by all callers and frozen with
+            :func:`networkx.freeze`; adding or removing nodes or edges raises
+            :class:`networkx.NetworkXError`. This property used to return a new,
+            mutable graph on every access, so code which modified it must now work
+            on a copy, e.g. ``instr.flow_graph.copy()``.
         """
+        import networkx as nx
         from .flow import flow_graph_from_records
-        return flow_graph_from_records(self.components, self.flow_edges)
+        names = list(map(_get_name, self.components))
+        cached = self.__dict__.get('_flow_graph')
+        if (cached is not None and cached[0] is self.components and cached[1] is self.flow_edges
+                and cached[2] == names):
+            return cached[3]
+        graph = nx.freeze(flow_graph_from_records(self.components, self.flow_edges))
+        self._flow_graph = self.components, self.flow_edges, names, graph
+        return graph
 
     def insert_component(
         self,
@@ -308,32 +401,29 @@ class Instr(Struct):
         # ── 0. Validate ────────────────────────────────────────────────────────
         if (before is None) == (after is None):
             raise ValueError("Exactly one of 'before' or 'after' must be specified.")
-        if any(x.name == name for x in self.components):
+        if self._component_index(name) is not None:
             raise ValueError(f"A component instance named {name!r} is already present.")
 
         # ── 1. Resolve reference component and insertion index ─────────────────
-        comp_names = [c.name for c in self.components]
         if before is not None:
             ref_name = before if isinstance(before, str) else before.name
-            if ref_name not in comp_names:
+            insert_idx = self._component_index(ref_name)
+            if insert_idx is None:
                 raise ValueError(f"Component {ref_name!r} not found.")
-            insert_idx = comp_names.index(ref_name)
             pred_inst = self.components[insert_idx - 1] if insert_idx > 0 else None
             succ_inst = self.components[insert_idx]
         else:
             ref_name = after if isinstance(after, str) else after.name
-            if ref_name not in comp_names:
+            target_idx = self._component_index(ref_name)
+            if target_idx is None:
                 raise ValueError(f"Component {ref_name!r} not found.")
-            target_idx = comp_names.index(ref_name)
             insert_idx = target_idx + 1
             pred_inst = self.components[target_idx]
             succ_inst = self.components[insert_idx] if insert_idx < len(self.components) else None
 
         # ── 2. Resolve component type ──────────────────────────────────────────
         if isinstance(component, str):
-            from ..reader import Reader
-            reader = Reader(registries=list(self.registries))
-            component = reader.get_component(component)
+            component = self._component_reader().get_component(component)
 
         # ── 3. Auto-compute position / rotation if not provided ────────────────
         orientations = self.resolve_orientations()
@@ -420,20 +510,20 @@ class Instr(Struct):
         return new_inst
 
     def add_parameter(self, a: InstrumentParameter, ignore_repeated=False):
-        if not parameter_name_present(self.parameters, a.name):
+        if self._parameter_named(a.name) is None:
+            by_name = self.parameters_by_name
             self.parameters += (a,)
+            by_name[a.name] = a
+            self._parameters_by_name = self.parameters, by_name
         elif not ignore_repeated:
             raise RuntimeError(f"An instrument parameter named {a.name} is already present in the instrument")
 
     def get_parameter(self, name, default=None):
-        if parameter_name_present(self.parameters, name):
-            for parameter in self.parameters:
-                if name == parameter.name:
-                    return parameter
-        return default
+        par = self._parameter_named(name)
+        return default if par is None else par
 
     def has_parameter(self, name):
-        return parameter_name_present(self.parameters, name)
+        return self._parameter_named(name) is not None
 
     def last_component(self, count: int = 1, removable_ok: bool = True):
         if len(self.components) < count:
@@ -450,13 +540,13 @@ class Instr(Struct):
     def get_component(self, name: str):
         if name == 'PREVIOUS':
             return self.components[-1]
-        for comp in self.components:
-            if comp.name == name:
-                return comp
-        raise RuntimeError(f"No component instance named {name} defined.")
+        idx = self._component_index(name)
+        if idx is None:
+            raise RuntimeError(f"No component instance named {name} defined.")
+        return self.components[idx]
 
     def has_component_named(self, name: str):
-        return any(comp.name == name for comp in self.components)
+        return self._component_index(name) is not None
 
     def get_component_names_by_category(self, category: str):
         """Find all component instance names for a given category.
@@ -491,19 +581,40 @@ class Instr(Struct):
         self.final += blocks_to_raw_c(*blocks)
 
     def add_metadata(self, m: MetaData):
-        if any([x.name == m.name for x in self.metadata]):
+        if any(x.name == m.name for x in self.metadata):
             self.metadata = tuple([x for x in self.metadata if x.name != m.name])
         self.metadata += (m,)
 
     @property
-    def groups(self):
-        return determine_groups(self.components)
+    def groups(self) -> dict[str, Group]:
+        """The named groups of component instances, in order of their first member.
+
+        Built once and reused until ``components`` is replaced or one of its instances
+        changes group in place; treat it as read-only.
+        """
+        components = self.components
+        group_names = list(map(_get_group, components))
+        cached = self.__dict__.get('_groups')
+        if cached is not None and cached[0] is components and cached[1] == group_names:
+            return cached[2]
+        groups = determine_groups(components)
+        self._groups = components, group_names, groups
+        return groups
 
     def component_types(self):
         # # If component order is unimportant, we can use a set:
         # return set(inst.type for inst in self.components)
         # For comparison with the C code generator, we must keep the order of component definitions
-        return list(dict.fromkeys([inst.type for inst in self.components]))
+        # Instances of one type nearly always share a single Comp object, so skip its (Python-level)
+        # __hash__ for every object already seen; distinct-but-equal definitions are still merged
+        seen = set()
+        types = {}
+        for inst in self.components:
+            comp = inst.type
+            if id(comp) not in seen:
+                seen.add(id(comp))
+                types.setdefault(comp, None)
+        return list(types)
 
     def collect_metadata(self):
         """Component definitions and instances can define metadata too, collect it all together here"""
@@ -527,6 +638,11 @@ class Instr(Struct):
             return self._getpath(chars).as_posix()
 
         def eval_cmd(chars):
+            # decoded_flags is called several times while translating and compiling an instrument;
+            # run each distinct command only once per instrument, rather than starting a new process each time
+            outputs = self.__dict__.setdefault('_cmd_outputs', {})
+            if chars in outputs:
+                return outputs[chars]
             from mccode_antlr.utils import run_prog_message_output
             from shlex import split
             message, output = run_prog_message_output(split(chars))
@@ -535,7 +651,8 @@ class Instr(Struct):
             output = [line.strip() for line in output.splitlines() if line.strip()]
             if len(output) > 1:
                 raise RuntimeError(f"Calling {chars} produced more than one line of output")
-            return output[0] if output else ''
+            outputs[chars] = output[0] if output else ''
+            return outputs[chars]
 
         def eval_env(chars):
             from os import environ
@@ -562,19 +679,19 @@ class Instr(Struct):
     def _replace_keywords(self, flag):
         from mccode_antlr.config import config
         from mccode_antlr.config.fallback import regex_sanitized_config_fallback
-        from re import sub, findall
+        if '@' not in flag:
+            return flag
         if '@NEXUSFLAGS@' in flag:
-            flag = sub(r'@NEXUSFLAGS@', config['flags']['nexus'].as_str_expanded(), flag)
+            flag = _NEXUSFLAGS_RE.sub(config['flags']['nexus'].as_str_expanded(), flag)
         if '@MCCODE_LIB@' in flag:
             print(f'The instrument {self.name} uses @MCCODE_LIB@ dependencies which no longer work.')
             print('Expect problems at compilation.')
-            flag = sub('@MCCODE_LIB@', '.', flag)
-        general_re = r'@(\w+)@'
-        for replace in findall(general_re, flag):
+            flag = _MCCODE_LIB_RE.sub('.', flag)
+        for replace in _KEYWORD_RE.findall(flag):
             # Is this replacement something like XXXFLAGS?
             if replace.lower().endswith('flags'):
                 replacement = regex_sanitized_config_fallback(config['flags'], replace.lower()[:-5])
-                flag = sub(f'@{replace}@', replacement, flag)
+                flag = re.sub(f'@{replace}@', replacement, flag)
             else:
                 logger.warning(f'Unknown keyword @{replace}@ in dependency string')
         return flag
@@ -600,22 +717,23 @@ class Instr(Struct):
 
     def copy(self, first=0, last=-1):
         """Return a copy of this instrument, optionally with only a subset of components"""
-        from copy import deepcopy
         copy = Instr(self.name, self.source)
-        copy.parameters = tuple(x for x in self.parameters)
-        copy.metadata = tuple(x.copy() for x in self.metadata)
+        # parameters, included, dependency and registries are tuples of immutable or shared values;
+        # reuse them rather than rebuilding them element by element
+        copy.parameters = self.parameters
+        copy.metadata = tuple([x.copy() for x in self.metadata])
         if last < 0:
             last += 1 + len(self.components)
-        copy.components = tuple(x.copy() for x in self.components[first:last])
-        copy.included = tuple(x for x in self.included)
-        copy.user = tuple(x.copy() for x in self.user)
-        copy.declare = tuple(x.copy() for x in self.declare)
-        copy.initialize = tuple(x.copy() for x in self.initialize)
-        copy.save = tuple(x.copy() for x in self.save)
-        copy.final = tuple(x.copy() for x in self.final)
+        copy.components = tuple([x.copy() for x in self.components[first:last]])
+        copy.included = self.included
+        copy.user = tuple([x.copy() for x in self.user])
+        copy.declare = tuple([x.copy() for x in self.declare])
+        copy.initialize = tuple([x.copy() for x in self.initialize])
+        copy.save = tuple([x.copy() for x in self.save])
+        copy.final = tuple([x.copy() for x in self.final])
         # copy.groups = {k: v.copy() for k, v in self.groups.items()}
-        copy.dependency = tuple(x for x in self.dependency)
-        copy.registries = tuple(x for x in self.registries)
+        copy.dependency = self.dependency
+        copy.registries = self.registries
         return copy
 
     def split(self, at, remove_unused_parameters=False):
@@ -676,14 +794,33 @@ class Instr(Struct):
                       parameters=None, group=None, removable=False):
         if parameters is None:
             parameters = tuple()
-        if any(x.name == name for x in self.components):
+        if self._component_index(name) is not None:
             raise RuntimeError(f"An instance named {name} is already present in the instrument")
         if isinstance(component, str):
-            from ..reader import Reader
-            reader = Reader(registries=list(self.registries))
-            component = reader.get_component(component)
+            component = self._component_reader().get_component(component)
         self.components += (Instance(name, component, at_relative, rotate_relative,
-                                     parameters, group, removable),)
+                                     parameters=parameters, group=group, removable=removable),)
+
+    def _component_reader(self):
+        """A Reader of this instrument's registries, reused (with the components it has read)
+        until the registries in ``registries`` change.
+
+        The Reader is keyed on the ``registries`` sequence and the registry objects it holds,
+        in order, so replacing the sequence or adding to or removing from it in place builds
+        a new one.
+        Changes made inside a registry (e.g. redefining a component in an ``InMemoryRegistry``
+        that has already been read, or changing a registry's priority) are not seen; assign a
+        new ``registries`` tuple to pick them up.
+        """
+        # the Reader holds on to the registries, so their ids can not be reused while it is cached
+        key = tuple(map(id, self.registries))
+        cached = self.__dict__.get('_reader')
+        if cached is not None and cached[0] is self.registries and cached[1] == key:
+            return cached[2]
+        from ..reader import Reader
+        reader = Reader(registries=list(self.registries))
+        self._reader = self.registries, key, reader
+        return reader
 
     def resolve_orientations(self) -> dict:
         """Resolve absolute orientations for every component in declaration order.
@@ -788,7 +925,19 @@ class Instr(Struct):
             The number of unused instrument parameters
         """
         names = [p.name for p in self.parameters]
-        used = [self.parameter_used(p.name) for p in self.parameters]
+        # Collect every name used by instance expressions and C code blocks once, rather than once per parameter.
+        # C blocks count a parameter as used if its name appears anywhere in their source (e.g., in a macro
+        # argument or token-pasted identifier), so only names missing from their identifiers need a substring search
+        referenced = set()
+        blocks = []
+        for instance in self.components:
+            referenced.update(instance.referenced_names())
+            blocks.extend(instance.extend)
+        for section in (self.declare, self.initialize, self.save, self.final):
+            blocks.extend(section)
+        for block in blocks:
+            referenced.update(block.identifiers)
+        used = [name in referenced or any(name in block for block in blocks) for name in names]
         if not all(used):
             logger.info(f'The following instrument parameters are not used in the instrument: '
                      f'{", ".join([n for n, u in zip(names, used) if not u])}')
@@ -813,18 +962,26 @@ class Instr(Struct):
         return expr
 
 
+# Computed once, rather than on every serialisation
+_FIELD_NAMES = tuple(f.name for f in fields(Instr))
+
+
 def _join_raw_tuple(raw_tuple: tuple[RawC, ...]):
     return '\n'.join([str(rc) for rc in raw_tuple])
 
 
-@lru_cache
+# Not lru_cache'd: hashing the instance tuple for a cache hit costs more than building
+# the groups (about 35 ms for 300 instances), and a cached result would miss in-place
+# group changes. Instr.groups caches the result per instrument instead.
 def determine_groups(instances) -> dict[str, Group]:
     groups = {}
     for id, inst in enumerate(instances):
-        if inst.group:
-            if inst.group not in groups:
-                groups[inst.group] = Group(inst.group, len(groups))
-            groups[inst.group].add(id, inst)
+        name = inst.group
+        if name:
+            group = groups.get(name)
+            if group is None:
+                group = groups[name] = Group(name, len(groups))
+            group.add(id, inst)
     return groups
 
 
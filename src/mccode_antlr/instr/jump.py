@@ -26,7 +26,7 @@ class Jump(Struct):
         if abs(self.relative_target) > 1:
             jump_name += f' ({abs(self.relative_target)})'
         when_iter = 'ITERATE' if self.iterate else 'WHEN'
-        print(wrapper.line('JUMP', [jump_name, when_iter, str(self.condition)]), file=output)
+        output.write(wrapper.line('JUMP', [jump_name, when_iter, str(self.condition)]) + '\n')
 
     def __contains__(self, value):
         return value in self.condition
@@ -1,5 +1,6 @@
 from __future__ import annotations
 from ..grammar import McInstrParser, McInstrVisitor
+from ..grammar.dispatch import DispatchVisitor
 from ..common import InstrumentParameter, MetaData, Expr
 from ..common.visitor import add_common_visitors
 from .instr import Instr
@@ -14,7 +15,7 @@ def literal_string(ctx):
     return stream.getText(start_token.start, stop_token.stop)
 
 
-class InstrVisitor(McInstrVisitor):
+class InstrVisitor(DispatchVisitor, McInstrVisitor):
     def __init__(self, parent, filename, destination=None, allow_assignment=False):
         self.parent = parent
         self.filename = filename
@@ -373,7 +374,7 @@ class InstrVisitor(McInstrVisitor):
         return [b for n in sorted(blocks.keys()) for b in blocks[n]]
 
 
-class InstrParametersVisitor(McInstrVisitor):
+class InstrParametersVisitor(DispatchVisitor, McInstrVisitor):
     """A visitor which takes a full parse tree and extracts only the instrument parameters"""
     def __init__(self):
         self.state = Instr()
@@ -385,7 +386,8 @@ class InstrParametersVisitor(McInstrVisitor):
 
     def visitInstrument_definition(self, ctx: McInstrParser.Instrument_definitionContext):
         self.state.name = str(ctx.Identifier())
-        self.visitChildren(ctx)
+        # only the parameter list contributes; walking the TRACE and code blocks would be wasted work
+        self.visit(ctx.instrument_parameters())
 
     def visitInstrument_parameters(self, ctx: McInstrParser.Instrument_parametersContext):
         for param in ctx.instrument_parameter():
@@ -4,14 +4,18 @@ import msgspec
 from mccode_antlr.io.utils import enc_hook, dec_hook, Model, from_model
 
 
+# msgspec encoders and decoders are reusable and thread-safe; build them once
+_ENCODER = msgspec.json.Encoder(enc_hook=enc_hook)
+_DECODER = msgspec.json.Decoder(dec_hook=dec_hook)
+_MODEL_DECODER = msgspec.json.Decoder(type=Model)
+
+
 def to_json(obj) -> bytes:
-    encoder = msgspec.json.Encoder(enc_hook=enc_hook)
-    return encoder.encode(Model.from_value(obj, encoder=encoder))
+    return _ENCODER.encode(Model.from_value(obj, encoder=_ENCODER))
 
 
 def from_json(msg: bytes):
-    decoder = msgspec.json.Decoder(dec_hook=dec_hook)
-    return from_model(decoder, msgspec.json.decode(msg, type=Model))
+    return from_model(_DECODER, _MODEL_DECODER.decode(msg))
 
 
 def save_json(obj, filename: str | Path) -> None:
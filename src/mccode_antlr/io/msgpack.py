@@ -4,14 +4,18 @@ import msgspec
 from mccode_antlr.io.utils import enc_hook, dec_hook, Model, from_model
 
 
+# msgspec encoders and decoders are reusable and thread-safe; build them once
+_ENCODER = msgspec.msgpack.Encoder(enc_hook=enc_hook)
+_DECODER = msgspec.msgpack.Decoder(dec_hook=dec_hook)
+_MODEL_DECODER = msgspec.msgpack.Decoder(type=Model)
+
+
 def to_msgpack(obj) -> bytes:
-    encoder = msgspec.msgpack.Encoder(enc_hook=enc_hook)
-    return encoder.encode(Model.from_value(obj, encoder=encoder))
+    return _ENCODER.encode(Model.from_value(obj, encoder=_ENCODER))
 
 
 def from_msgpack(msg: bytes):
-    decoder = msgspec.msgpack.Decoder(dec_hook=dec_hook)
-    return from_model(decoder, msgspec.msgpack.decode(msg, type=Model))
+    return from_model(_DECODER, _MODEL_DECODER.decode(msg))
 
 
 def save_msgpack(obj, filename: str | Path) -> None:
@@ -68,14 +68,12 @@ def parse_mcdoc(source: str) -> dict[str, tuple[Optional[str], Optional[str]]]:
     if not cleaned:
         return {}
 
-    from antlr4 import InputStream
-    from mccode_antlr.grammar import McDoc_parse
+    from mccode_antlr.grammar.mcdoc_parse import mcdoc_sections
     from .visitor import McDocExtractVisitor
 
-    stream = InputStream(cleaned)
-    tree = McDoc_parse(stream, 'mcdoc')
     visitor = McDocExtractVisitor()
-    visitor.visit(tree)
+    for tag, lines in mcdoc_sections(cleaned):
+        visitor.add_section(tag, lines)
     return visitor.parameters
 
 
@@ -94,14 +92,11 @@ def parse_mcdoc_full(source: str) -> 'McDocFullExtractor':
     ``info_fields``, ``short_desc``, ``desc_lines``, ``parameters``, and
     ``link_lines`` from the first McDoc block comment found.
     """
-    from antlr4 import InputStream
-    from mccode_antlr.grammar import McDoc_parse
+    from mccode_antlr.grammar.mcdoc_parse import mcdoc_sections
     from .visitor import McDocFullExtractor
 
     cleaned = _preprocess(source)
     visitor = McDocFullExtractor()
-    if cleaned:
-        stream = InputStream(cleaned)
-        tree = McDoc_parse(stream, 'mcdoc')
-        visitor.visit(tree)
+    for tag, lines in mcdoc_sections(cleaned):
+        visitor.add_section(tag, lines)
     return visitor
@@ -6,6 +6,7 @@ from typing import Optional
 
 from antlr4 import ParseTreeVisitor
 
+from mccode_antlr.grammar.dispatch import DispatchVisitor
 from mccode_antlr.grammar.McDocVisitor import McDocVisitor
 from mccode_antlr.grammar.McDocParser import McDocParser
 
@@ -16,20 +17,32 @@ from . import _PARAM_RE, _HEADING_RE
 _INFO_FIELD_RE = re.compile(r'^(?P<key>[A-Za-z][A-Za-z0-9 _]*):\s*(?P<value>.*)$')
 
 
-class McDocExtractVisitor(McDocVisitor):
-    """Visitor that collects parameter (name, unit, description) from a McDoc tree."""
+def _line_texts(ctx) -> list[str]:
+    """The LINE token texts of a tagged section context"""
+    return [line.LINE().getText() for line in ctx.line()]
+
+
+class McDocExtractVisitor(DispatchVisitor, McDocVisitor):
+    """Visitor that collects parameter (name, unit, description) from a McDoc tree.
+
+    The same data can be collected without a parse tree by passing the output of
+    :func:`~mccode_antlr.grammar.mcdoc_parse.mcdoc_sections` to :meth:`add_section`.
+    """
 
     def __init__(self):
         self.parameters: dict[str, tuple[Optional[str], Optional[str]]] = {}
 
+    def add_section(self, tag: int, lines: list[str]) -> None:
+        """Collect the content lines of one section, identified by its tag token type."""
+        if tag == McDocParser.PARAM_TAG:
+            for text in lines:
+                self._process_param_line(text)
+
     # ── Only the parameter section contains structured data we need ──────────
 
     def visitParamSection(self, ctx: McDocParser.ParamSectionContext):
         """Iterate the content lines of a %P section and extract parameter entries."""
-        for child in ctx.getChildren():
-            # Each child is either a `line` rule context or a NEWLINE token.
-            if isinstance(child, McDocParser.LineContext):
-                self._process_param_line(child.LINE().getText())
+        self.add_section(McDocParser.PARAM_TAG, _line_texts(ctx))
         return None
 
     # ── All other sections are ignored for parameter extraction ──────────────
@@ -65,7 +78,7 @@ class McDocExtractVisitor(McDocVisitor):
         )
 
 
-class McDocFullExtractor(McDocVisitor):
+class McDocFullExtractor(DispatchVisitor, McDocVisitor):
     """Visitor that extracts all McDoc sections for header reformatting.
 
     Attributes
@@ -89,45 +102,55 @@ class McDocFullExtractor(McDocVisitor):
         self.parameters: dict[str, tuple[Optional[str], Optional[str]]] = {}
         self.link_lines: list[str] = []
 
+    def add_section(self, tag: int, lines: list[str]) -> None:
+        """Collect the content lines of one section, identified by its tag token type."""
+        if tag == McDocParser.INFO_TAG:
+            self._info_lines(lines)
+        elif tag == McDocParser.DESC_TAG:
+            self.desc_lines.extend(lines)
+        elif tag == McDocParser.PARAM_TAG:
+            self._param_lines(lines)
+        elif tag == McDocParser.LINK_TAG:
+            self.link_lines.extend(text.strip() for text in lines)
+
+    def _info_lines(self, lines: list[str]) -> None:
+        for text in lines:
+            text = text.strip()
+            m = _INFO_FIELD_RE.match(text)
+            if m:
+                self.info_fields[m.group('key')] = m.group('value').strip()
+            elif text:
+                self.short_desc.append(text)
+
+    def _param_lines(self, lines: list[str]) -> None:
+        for text in lines:
+            stripped = text.strip()
+            if not stripped or _HEADING_RE.match(stripped):
+                continue
+            m = _PARAM_RE.match(stripped)
+            if m:
+                name = m.group('name')
+                unit = m.group('unit')
+                desc = m.group('desc')
+                self.parameters[name] = (
+                    unit.strip() if unit else None,
+                    desc.strip() if desc else None,
+                )
+
     def visitInfoSection(self, ctx: McDocParser.InfoSectionContext):
-        for child in ctx.getChildren():
-            if isinstance(child, McDocParser.LineContext):
-                text = child.LINE().getText().strip()
-                m = _INFO_FIELD_RE.match(text)
-                if m:
-                    self.info_fields[m.group('key')] = m.group('value').strip()
-                elif text:
-                    self.short_desc.append(text)
+        self.add_section(McDocParser.INFO_TAG, _line_texts(ctx))
         return None
 
     def visitDescSection(self, ctx: McDocParser.DescSectionContext):
-        for child in ctx.getChildren():
-            if isinstance(child, McDocParser.LineContext):
-                self.desc_lines.append(child.LINE().getText())
+        self.add_section(McDocParser.DESC_TAG, _line_texts(ctx))
         return None
 
     def visitParamSection(self, ctx: McDocParser.ParamSectionContext):
-        for child in ctx.getChildren():
-            if isinstance(child, McDocParser.LineContext):
-                text = child.LINE().getText()
-                stripped = text.strip()
-                if not stripped or _HEADING_RE.match(stripped):
-                    continue
-                m = _PARAM_RE.match(stripped)
-                if m:
-                    name = m.group('name')
-                    unit = m.group('unit')
-                    desc = m.group('desc')
-                    self.parameters[name] = (
-                        unit.strip() if unit else None,
-                        desc.strip() if desc else None,
-                    )
+        self.add_section(McDocParser.PARAM_TAG, _line_texts(ctx))
         return None
 
     def visitLinkSection(self, ctx: McDocParser.LinkSectionContext):
-        for child in ctx.getChildren():
-            if isinstance(child, McDocParser.LineContext):
-                self.link_lines.append(child.LINE().getText().strip())
+        self.add_section(McDocParser.LINK_TAG, _line_texts(ctx))
         return None
 
     def visitOtherSection(self, ctx: McDocParser.OtherSectionContext):
@@ -2,6 +2,7 @@ from __future__ import annotations
 from pathlib import Path
 from mccode_antlr import Flavor
 from mccode_antlr.instr import Instr
+from mccode_antlr.grammar.mccode_parse import pause_gc_while_parsing
 
 def regular_mccode_runtime_dict(args: dict) -> dict:
     def insert_best_of(src: dict, snk: dict, names: tuple):
@@ -342,10 +343,12 @@ def mccode_run_cmd(flavor: Flavor):
     mccode_run_scan(name, binary, target, parameters, args.directory, args.mesh, **runtime)
 
 
+@pause_gc_while_parsing()
 def mcstas_cmd():
     mccode_run_cmd(Flavor.MCSTAS)
 
 
+@pause_gc_while_parsing()
 def mcxtrace_cmd():
     mccode_run_cmd(Flavor.MCXTRACE)
 
@@ -10,6 +10,7 @@ import sympy
 from loguru import logger
 
 from ..grammar import CParser, CVisitor
+from ..grammar.dispatch import DispatchVisitor
 from ..common import Expr
 from ..common.expression.sympy_classes import (
     CTernary, CArrayIndex, CStructAccess, CPointerAccess,
@@ -139,7 +140,7 @@ def _parse_constant(text: str) -> Expr:
 # CBlockEvaluator
 # ---------------------------------------------------------------------------
 
-class CBlockEvaluator(CVisitor):
+class CBlockEvaluator(DispatchVisitor, CVisitor):
     """Evaluate a C compound statement, updating a symbolic variable state.
 
     Tracks three state dictionaries:
@@ -1063,6 +1064,7 @@ def evaluate_c_block(
     from antlr4 import InputStream, CommonTokenStream
     from antlr4.error.ErrorListener import ErrorListener
     from ..grammar import CLexer
+    from ..grammar.mccode_parse import intern_identifiers
     from .c_listener import make_error_listener
 
     if known is None:
@@ -1071,7 +1073,7 @@ def evaluate_c_block(
     text = block if block.lstrip().startswith('{') else f'{{\n{block}\n}}'
 
     stream = InputStream(text)
-    lexer = CLexer(stream)
+    lexer = intern_identifiers(CLexer(stream))
     tokens = CommonTokenStream(lexer)
     parser = CParser(tokens)
     parser.addErrorListener(make_error_listener(ErrorListener, text))
@@ -4,6 +4,7 @@ from typing import TypeVar
 
 from loguru import logger
 from ..grammar import CParser, McInstrParser, CVisitor
+from ..grammar.dispatch import DispatchVisitor
 from ..instr import InstrVisitor
 from ..common import Expr
 
@@ -209,7 +210,7 @@ def extract_initializer_size(init: str) -> tuple[int,...]:
     return tuple(reversed(size))
 
 
-class DeclaresCVisitor(CVisitor):
+class DeclaresCVisitor(DispatchVisitor, CVisitor):
     def __init__(self, typedefs: list | None = None, verbose: bool = False):
         self.verbose = verbose
         self.typedefs = [x for x in typedefs] if typedefs else []
@@ -369,8 +370,9 @@ def extract_c_declared_variables_and_defined_types(
     from antlr4 import InputStream, CommonTokenStream
     from antlr4.error.ErrorListener import ErrorListener
     from ..grammar import CLexer
+    from ..grammar.mccode_parse import intern_identifiers
     stream = InputStream(block)
-    lexer = CLexer(stream)
+    lexer = intern_identifiers(CLexer(stream))
     tokens = CommonTokenStream(lexer)
     parser = CParser(tokens)
     parser.addErrorListener(make_error_listener(ErrorListener, block))
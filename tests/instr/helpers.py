@@ -0,0 +1,9 @@
+"""Shared helpers for the instrument tests."""
+from mccode_antlr.comp import Comp
+from mccode_antlr.instr import Instance
+from mccode_antlr.instr.orientation import Vector, Angles
+
+
+def arm(name, at=None, **kwargs):
+    """Return an Arm instance, at the origin unless ``at`` is given, without parsing an instrument."""
+    return Instance(name, Comp(name='Arm'), (Vector() if at is None else at, None), (Angles(), None), **kwargs)
@@ -53,3 +53,13 @@ def test_ncrystal_windows_flags():
 
     assert no_backslashes(flag) == no_backslashes(config['ncrystal'].get())
 
+
+def test_cmd_flag_runs_once_per_instrument():
+    from unittest.mock import patch
+    from mccode_antlr.instr import Instr
+    instr = Instr('cmd_flags')
+    instr.DEPENDENCY('CMD(fake-config --cflags)')
+    with patch('mccode_antlr.utils.run_prog_message_output', return_value=(None, '-DFAKE\n')) as run:
+        assert instr.decoded_flags() == ['-DFAKE']
+        assert instr.decoded_flags() == ['-DFAKE']
+    assert run.call_count == 1
@@ -9,8 +9,11 @@ from mccode_antlr.instr.flow import (
     JumpEdge,
     AnyFlowEdge,
 )
+from mccode_antlr.instr import Instr
 import msgspec
 
+from .helpers import arm
+
 
 def _flow(G, u, v):
     """Return the list of FlowEdge payloads on all edges from u to v."""
@@ -26,7 +29,6 @@ def _flows(G, u, v):
         return []
     return [data['flow'] for data in G[u][v].values()]
 
-
 class TestBuildParticleFlowGraph(TestCase):
 
     # ------------------------------------------------------------------
@@ -297,3 +299,157 @@ class TestBuildInstanceIO(TestCase):
         self.assertIsInstance(io, InstanceIO)
         self.assertIsInstance(io.inputs, dict)
         self.assertIsInstance(io.outputs, dict)
+
+
+class TestFlowGraphCache(TestCase):
+
+    def test_flow_graph_reused_until_edges_replaced(self):
+        import networkx as nx
+        instr = Instr()
+        instr.add_flow_edge('a', 'b', SequentialEdge())
+        G = instr.flow_graph
+        self.assertIs(instr.flow_graph, G)
+        self.assertTrue(nx.is_frozen(G))
+        instr.add_flow_edge('b', 'c', SequentialEdge())
+        self.assertIsNot(instr.flow_graph, G)
+        self.assertEqual(set(instr.flow_graph.edges()), {('a', 'b'), ('b', 'c')})
+        self.assertEqual(set(G.edges()), {('a', 'b')})
+
+    def test_flow_graph_follows_renamed_instances(self):
+        import networkx as nx
+        instr = Instr()
+        for name in 'ab':
+            instr.add_component(arm(name))
+        G = instr.flow_graph
+        self.assertIs(instr.flow_graph, G)
+        with self.assertRaises(nx.NetworkXError):
+            G.add_edge('a', 'a')
+        instr.components[1].name = 'renamed'
+        self.assertIn('renamed', instr.flow_graph)
+        self.assertNotIn('renamed', G)
+
+    def test_flow_graph_cache_not_serialised(self):
+        instr = Instr(name='cached')
+        instr.add_flow_edge('a', 'b', SequentialEdge())
+        instr.flow_graph
+        self.assertEqual(instr, Instr(name='cached', flow_edges=instr.flow_edges))
+        self.assertNotIn(b'_flow_graph', msgspec.json.encode(instr))
+
+    def test_name_to_idx_follows_components(self):
+        instr = Instr()
+        for name in 'abc':
+            instr.add_component(arm(name))
+        self.assertEqual(instr.name_to_idx, {'a': 0, 'b': 1, 'c': 2})
+        with self.assertRaises(RuntimeError):
+            instr.add_component(arm('b'))
+        instr.components = instr.components[::-1]
+        self.assertEqual(instr.name_to_idx, {'c': 0, 'b': 1, 'a': 2})
+        with self.assertRaises(TypeError):
+            instr.name_to_idx['d'] = 3
+
+    def test_groups_follow_components(self):
+        instr = Instr()
+        for name, group in (('a', None), ('b', 'g'), ('c', 'g'), ('d', 'h')):
+            instr.add_component(arm(name, group=group))
+        groups = instr.groups
+        self.assertIs(instr.groups, groups)
+        self.assertEqual([('g', 0, [1, 2]), ('h', 1, [3])], [(k, g.index, g.ids) for k, g in groups.items()])
+        instr.components = instr.components[:2]
+        self.assertEqual([('g', 0, [1])], [(k, g.index, g.ids) for k, g in instr.groups.items()])
+
+    def test_lookups_follow_renamed_instances(self):
+        from mccode_antlr.common import InstrumentParameter, Expr
+        instr = Instr()
+        for name in 'abc':
+            instr.add_component(arm(name))
+        instr.add_parameter(InstrumentParameter('x', '', Expr.float(1)))
+        self.assertIs(instr.get_component('b'), instr.components[1])
+        self.assertEqual(instr.groups, {})
+        self.assertTrue(instr.has_parameter('x'))
+        instr.components[1].name = 'renamed'
+        instr.components[2].group = 'g'
+        instr.parameters[0].name = 'y'
+        self.assertFalse(instr.has_component_named('b'))
+        self.assertIs(instr.get_component('renamed'), instr.components[1])
+        self.assertEqual(instr.name_to_idx, {'a': 0, 'renamed': 1, 'c': 2})
+        self.assertEqual(list(instr.groups), ['g'])
+        self.assertFalse(instr.has_parameter('x'))
+        self.assertIs(instr.get_parameter('y'), instr.parameters[0])
+        # the freed name can be reused
+        instr.add_component(arm('b'))
+        self.assertEqual(instr.name_to_idx['b'], 3)
+
+    def test_derived_records_reused_until_components_replaced(self):
+        instr = Instr()
+        for name in 'abc':
+            instr.add_component(arm(name))
+        instr.flow_edges = ()
+        build_particle_flow_graph(instr)
+        self.assertEqual(instr.flow_edges, ())
+        instr.build_flow_graph()
+        edges = instr.flow_edges
+        G = instr.flow_graph
+        instr.build_flow_graph()
+        self.assertIs(instr.flow_edges, edges)
+        self.assertIs(instr.flow_graph, G)
+        instr.components = instr.components[:2]
+        self.assertEqual(len(instr.build_flow_graph().edges), 1)
+
+    def test_edge_view_matches_graph(self):
+        from mccode_antlr.instr import FlowEdgeView
+        instr = Instr()
+        for name, group in (('a', None), ('b', 'g'), ('c', 'g'), ('d', None)):
+            instr.add_component(arm(name, group=group))
+        G = build_particle_flow_graph(instr)
+        view = build_particle_flow_graph(instr, as_view=True)
+        self.assertIsInstance(view, FlowEdgeView)
+        self.assertEqual(list(view), list(G))
+        self.assertIs(view.nodes['c']['instance'], G.nodes['c']['instance'])
+        self.assertCountEqual([(u, v, d['flow']) for u, v, d in view.edges(data=True)],
+                              [(u, v, d['flow']) for u, v, d in G.edges(data=True)])
+
+
+class TestFlowEdgeRecordFromDict(TestCase):
+
+    def test_every_edge_type_roundtrips(self):
+        from mccode_antlr.common import Expr
+        from mccode_antlr.instr.flow import FlowEdgeRecord, WeightedRandomEdge
+        edges = [
+            SequentialEdge(), SequentialEdge(when=Expr.parse('x > 1')),
+            GroupEdge(group_name='G', kind=GroupEdgeKind.SCATTER_EXIT),
+            JumpEdge(condition=Expr.parse('n < 3'), iterate=True, absolute_target=2),
+            WeightedRandomEdge(), WeightedRandomEdge(weight=0.5, condition=Expr.parse('y')),
+        ]
+        for edge in edges:
+            record = FlowEdgeRecord(src='a', dst='b', edge=edge)
+            data = msgspec.to_builtins(record, enc_hook=lambda e: e.to_dict())
+            self.assertEqual(FlowEdgeRecord.from_dict(data), record)
+            self.assertEqual(data['edge']['type'], type(edge).__struct_config__.tag)
+
+    def test_bulk_conversion_matches_from_dict(self):
+        from mccode_antlr.common import Expr
+        from mccode_antlr.instr.flow import FlowEdgeRecord, WeightedRandomEdge, flow_edges_from_builtins
+        records = tuple(FlowEdgeRecord(src='a', dst='b', edge=edge) for edge in (
+            SequentialEdge(when=Expr.parse('x > 1')),
+            GroupEdge(group_name='G', kind=GroupEdgeKind.SCATTER_EXIT),
+            JumpEdge(condition=Expr.parse('n < 3'), iterate=True, absolute_target=2),
+            WeightedRandomEdge(weight=0.5),
+        ))
+        data = msgspec.to_builtins(records, enc_hook=lambda e: e.to_dict())
+        self.assertEqual(flow_edges_from_builtins(data), records)
+        self.assertEqual(flow_edges_from_builtins(data), tuple(FlowEdgeRecord.from_dict(a) for a in data))
+
+    def test_bulk_conversion_interns_names(self):
+        import sys
+        from mccode_antlr.instr.flow import flow_edges_from_builtins
+        # names built at runtime, so not the interned literals
+        src, dst = ''.join(['sou', 'rce']), ''.join(['dest', 'ination'])
+        data = [{'src': src, 'dst': dst, 'edge': {'type': 'sequential'}}]
+        record, = flow_edges_from_builtins(data)
+        self.assertIs(record.src, sys.intern(src))
+        self.assertIs(record.dst, sys.intern(dst))
+
+    def test_unknown_edge_type(self):
+        from mccode_antlr.instr.flow import FlowEdgeRecord
+        with self.assertRaises(ValueError):
+            FlowEdgeRecord.from_dict({'src': 'a', 'dst': 'b', 'edge': {'type': 'teleport'}})
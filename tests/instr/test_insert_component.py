@@ -293,3 +293,59 @@ class TestInsertComponentPositioning(TestCase):
         _, ref_inst = inst.at_relative
         # Reference must have been re-expressed relative to 'a' (the predecessor)
         self.assertIs(ref_inst, a_inst)
+
+
+class TestMakeInstance(TestCase):
+
+    def test_make_instance_reuses_reader_and_sets_fields(self):
+        from textwrap import dedent
+        from mccode_antlr.instr import Instr
+        from mccode_antlr.instr.orientation import Vector, Angles
+        from mccode_antlr.reader.registry import InMemoryRegistry
+        comps = InMemoryRegistry('components')
+        comps.add_comp('Only', dedent("""
+        DEFINE COMPONENT Only
+        SETTING PARAMETERS (a=1.)
+        END
+        """))
+        instr = Instr('made', registries=(comps,))
+        for name in ('one', 'two'):
+            instr.make_instance(name, 'Only', (Vector(), None), (Angles(), None))
+        one, two = instr.components
+        self.assertIs(one.type, two.type)
+        with self.assertRaises(RuntimeError):
+            instr.make_instance('one', 'Only', (Vector(), None), (Angles(), None))
+
+    def test_make_instance_sees_registries_added_in_place(self):
+        from textwrap import dedent
+        from mccode_antlr.instr import Instr
+        from mccode_antlr.instr.orientation import Vector, Angles
+        from mccode_antlr.reader.registry import InMemoryRegistry
+        first, second = InMemoryRegistry('first'), InMemoryRegistry('second')
+        for registry, name in ((first, 'One'), (second, 'Two')):
+            registry.add_comp(name, dedent(f"""
+            DEFINE COMPONENT {name}
+            SETTING PARAMETERS (a=1.)
+            END
+            """))
+        registries = [first]
+        instr = Instr('made', registries=registries)
+        instr.make_instance('one', 'One', (Vector(), None), (Angles(), None))
+        registries.append(second)
+        instr.make_instance('two', 'Two', (Vector(), None), (Angles(), None))
+        self.assertEqual('Two', instr.components[1].type.name)
+
+    def test_make_instance_sets_group_and_removable(self):
+        # group and removable were once passed positionally, landing in removable and cpu
+        from mccode_antlr.comp import Comp
+        from mccode_antlr.instr import Instr
+        from mccode_antlr.instr.orientation import Vector, Angles
+        instr = Instr('made')
+        instr.make_instance('one', Comp(name='Arm'), (Vector(), None), (Angles(), None), group='g', removable=True)
+        instr.make_instance('two', Comp(name='Arm'), (Vector(), None), (Angles(), None))
+        one, two = instr.components
+        self.assertEqual('g', one.group)
+        self.assertTrue(one.removable)
+        self.assertFalse(one.cpu)
+        self.assertIsNone(two.group)
+        self.assertFalse(two.removable)
@@ -1,6 +1,8 @@
 from unittest import TestCase
 from loguru import logger
 
+from .helpers import arm
+
 
 class TestInstrInstanceParameters(TestCase):
     def test_assemble_identifier_instance_parameter(self):
@@ -174,3 +176,34 @@ class TestInstrInstanceParameters(TestCase):
         for x in ('theta_0', 'radius', 'nslit', 'yheight'):
             par = bwc1.get_parameter(x).value
             self.assertFalse(any(par.depends_on(inst_par.name) for inst_par in assembler.instrument.parameters))
+
+    def test_referenced_names(self):
+        from mccode_antlr.common import Expr, RawC
+        from mccode_antlr.common.parameters import ComponentParameter
+        from mccode_antlr.instr.orientation import Vector
+        parameters = (ComponentParameter('xwidth', Expr.parse('2*fmod(par5, 0.1)')),)
+        at = Vector(Expr.parse('0'), Expr.parse('0'), Expr.parse('dist'))
+        instance = arm('mon', at, parameters=parameters, when=Expr.parse('flag > 0'),
+                       extend=(RawC('', 0, 'double v = speed;'),))
+        self.assertEqual({'par5', 'dist', 'flag'}, instance.referenced_names())
+        self.assertTrue(instance.parameter_used('par5'))
+        self.assertTrue(instance.parameter_used('speed'))
+        # EXTEND blocks are raw C, searched for substrings
+        self.assertTrue(instance.parameter_used('spee'))
+        self.assertFalse(instance.parameter_used('par'))
+
+    def test_comp_parameters_by_name_follows_settings(self):
+        from mccode_antlr.comp import Comp
+        from mccode_antlr.common import Expr
+        from mccode_antlr.common.parameters import ComponentParameter
+        comp = Comp(name='Only', define=(ComponentParameter('a', Expr.float(1)),))
+        self.assertTrue(comp.has_parameter('a'))
+        self.assertFalse(comp.has_parameter('b'))
+        b = ComponentParameter('b', Expr.float(2))
+        comp.add_setting(b)
+        self.assertIs(comp.get_parameter('b'), b)
+        self.assertEqual(comp, Comp(name='Only', define=comp.define, setting=comp.setting))
+        # a parameter renamed in place is picked up when its old name is looked up
+        b.name = 'c'
+        self.assertFalse(comp.has_parameter('b'))
+        self.assertIs(comp.get_parameter('c'), b)
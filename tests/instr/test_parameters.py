@@ -1,5 +1,7 @@
 from unittest import TestCase
 
+from .helpers import arm
+
 
 class TestInstrParameters(TestCase):
 
@@ -15,6 +17,15 @@ class TestInstrParameters(TestCase):
         self.assertEqual(instr_parameters[1].value, -74)
         self.assertEqual(instr_parameters[2].value, 30)
 
+    def test_parameters_ignore_trace(self):
+        from mccode_antlr.loader.loader import parse_mccode_instr_parameters
+        contents = """DEFINE INSTRUMENT t(a=1) TRACE
+        COMPONENT o = Arm() AT (0, 0, 0) ABSOLUTE
+        COMPONENT s = Arm() AT (0, 0, PREVIOUS) RELATIVE o
+        END"""
+        instr_parameters = parse_mccode_instr_parameters(contents)
+        self.assertEqual([p.name for p in instr_parameters], ['a'])
+
     def test_used_parameter_check(self):
         from mccode_antlr import Flavor
         from mccode_antlr.assembler import Assembler
@@ -116,3 +127,35 @@ class TestInstrParameters(TestCase):
         self.assertIn('g', params)
         self.assertEqual(params['g'].value.data_type, DataType.str)
         self.assertFalse(params['g'].value.is_vector)
+
+    def test_parameter_lookup_follows_parameters(self):
+        from mccode_antlr.instr import Instr
+        from mccode_antlr.common import InstrumentParameter, Expr
+        instr = Instr('lookup')
+        a = InstrumentParameter('a', '', Expr.float(1))
+        instr.add_parameter(a)
+        self.assertIs(instr.get_parameter('a'), a)
+        self.assertFalse(instr.has_parameter('b'))
+        with self.assertRaises(RuntimeError):
+            instr.add_parameter(InstrumentParameter('a', '', Expr.float(2)))
+        b = InstrumentParameter('b', '', Expr.float(2))
+        instr.parameters = (b,)
+        self.assertIsNone(instr.get_parameter('a'))
+        self.assertIs(instr.get_parameter('b'), b)
+
+    def test_check_instrument_parameters_without_registry(self):
+        from mccode_antlr.instr import Instr
+        from mccode_antlr.instr.orientation import Vector
+        from mccode_antlr.common import InstrumentParameter, Expr, RawC
+        instr = Instr('check')
+        for name in ('in_expr', 'in_extend', 'in_declare', 'pasted', 'unused'):
+            instr.add_parameter(InstrumentParameter(name, '', Expr.float(0)))
+        instr.DECLARE('double y = in_declare;')
+        # C blocks are searched for substrings, so a name only present inside a longer identifier still counts
+        instr.INITIALIZE('y += MC_GETPAR(instrument_pasted);')
+        at = Vector(Expr.parse('0'), Expr.parse('0'), Expr.parse('in_expr'))
+        instr.add_component(arm('o', at, extend=(RawC('', 0, 'x = in_extend;'),)))
+        self.assertEqual(1, instr.check_instrument_parameters())
+        self.assertEqual(1, instr.check_instrument_parameters(remove=True))
+        self.assertEqual(['in_expr', 'in_extend', 'in_declare', 'pasted'], [p.name for p in instr.parameters])
+        self.assertTrue(instr.parameter_used('pasted'))
@@ -99,3 +99,18 @@ def test_mcpl_component_json_round_trip():
     assert comp.dependency == '@MCPLFLAGS@'
 
 
+def test_dep_instance_from_dict_legacy_fallback():
+    import msgspec
+    from mccode_antlr.comp import Comp
+    from mccode_antlr.instr.instance import Instance, DepInstance
+    from mccode_antlr.instr.orientation import Vector, Angles
+    origin = Instance('origin', Comp(name='Arm'), (Vector(), None), (Angles(), None))
+    inst = Instance('a', Comp(name='Arm'), (Vector(z=Expr.float(1)), origin), (Angles(), origin),
+                    when=Expr.parse('x > 0'), group='g')
+    data = msgspec.to_builtins(DepInstance.from_independent(inst), enc_hook=lambda e: e.to_dict())
+    native = DepInstance.from_dict(data)
+    assert native == DepInstance.from_independent(inst)
+    # An older format with an extra key and an empty WHEN is decoded field-by-field
+    legacy = msgspec.to_builtins(DepInstance.from_independent(origin), enc_hook=lambda e: e.to_dict())
+    legacy.update(orientation={}, when={})
+    assert DepInstance.from_dict(legacy) == DepInstance.from_independent(origin)
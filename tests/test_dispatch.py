@@ -0,0 +1,94 @@
+"""Table-driven visitor dispatch must call the same methods as ANTLR's accept()."""
+from antlr4 import InputStream
+
+from mccode_antlr.grammar import McDoc_parse, McDocParser, McDocVisitor
+from mccode_antlr.grammar.dispatch import DispatchVisitor
+
+
+TEXT = '%I\nfirst\nsecond\n%E\norphan\n'
+
+
+class Lines(McDocVisitor):
+    def __init__(self):
+        self.lines = []
+
+    def visitLine(self, ctx):
+        self.lines.append(ctx.LINE().getText())
+
+    def aggregateResult(self, aggregate, nextResult):
+        return (aggregate or 0) + 1
+
+
+class DispatchLines(DispatchVisitor, Lines):
+    pass
+
+
+def test_dispatch_matches_accept():
+    tree = McDoc_parse(InputStream(TEXT), 'mcdoc')
+    plain, dispatched = Lines(), DispatchLines()
+    assert plain.visit(tree) == dispatched.visit(tree)
+    assert plain.lines == dispatched.lines == ['first', 'second', 'orphan']
+
+
+def test_dispatch_skips_generated_stubs():
+    tree = McDoc_parse(InputStream(TEXT), 'mcdoc')
+    DispatchLines().visit(tree)
+    table = DispatchLines.build_dispatch()
+    assert table[McDocParser.McdocContext] is DispatchVisitor.visitChildren
+    assert table[type(tree.section(0).line(0))] is Lines.visitLine
+
+
+def test_dispatch_finds_methods_attached_before_first_visit():
+    class Late(DispatchVisitor, McDocVisitor):
+        pass
+
+    seen = []
+    Late.visitEndSection = lambda self, ctx: seen.append(ctx.getText())
+    Late().visit(McDoc_parse(InputStream(TEXT), 'mcdoc'))
+    assert seen == ['%E\n']
+
+
+class Shape(McDocVisitor):
+    """Records the nesting of results, and stops after two children of any node"""
+    def defaultResult(self):
+        return ()
+
+    def aggregateResult(self, aggregate, nextResult):
+        return aggregate + (nextResult,)
+
+    def shouldVisitNextChild(self, node, currentResult):
+        return len(currentResult) < 2
+
+    def visitTerminal(self, node):
+        return node.getText()
+
+
+class DispatchShape(DispatchVisitor, Shape):
+    pass
+
+
+def test_dispatch_iterative_walk_matches_recursion():
+    for text in (TEXT, '', '%P\na: [m] b\n\n\nc: d\n%D\n%E'):
+        tree = McDoc_parse(InputStream(text), 'mcdoc')
+        assert Shape().visit(tree) == DispatchShape().visit(tree)
+
+
+class Last(McDocVisitor):
+    """Keeps the runtime's default result handling, returning the last visited result"""
+    def visitTerminal(self, node):
+        return node.getText()
+
+    def visitBlankLine(self, ctx):
+        self.visitChildren(ctx)
+
+
+class DispatchLast(DispatchVisitor, Last):
+    pass
+
+
+def test_dispatch_default_results_match_recursion():
+    for text in (TEXT, '', '%P\na: [m] b\n\n\nc: d\n%D\n%E', 'x\n\n'):
+        tree = McDoc_parse(InputStream(text), 'mcdoc')
+        assert Last().visit(tree) == DispatchLast().visit(tree)
+        for section in tree.section():
+            assert Last().visitChildren(section) == DispatchLast().visitChildren(section)
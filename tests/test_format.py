@@ -369,6 +369,44 @@ class TestCLI:
         finally:
             sys.argv = old_argv
 
+    def test_mcfmt_parallel_inplace(self, tmp_path, capsys):
+        """mcfmt -j formats several files in worker processes, reporting in order."""
+        names = [f'test{i}.instr' for i in range(3)]
+        for name in names:
+            (tmp_path / name).write_text(f'define instrument {name[:-6]}()\ntrace\nend\n')
+        (tmp_path / 'broken.instr').write_text('define instrument\n')
+        from mccode_antlr.cli.format import mcfmt
+        import sys
+        old_argv = sys.argv
+        try:
+            sys.argv = ['mcfmt', '-j', '2', '--inplace'] + [str(tmp_path / n) for n in names + ['broken.instr']]
+            with pytest.raises(SystemExit) as exc:
+                mcfmt()
+            assert exc.value.code == 1
+        finally:
+            sys.argv = old_argv
+        for name in names:
+            assert f'DEFINE INSTRUMENT {name[:-6]}' in (tmp_path / name).read_text()
+        reports = capsys.readouterr().err.splitlines()
+        assert reports[:3] == [f'Reformatted {tmp_path / n}' for n in names]
+        assert 'broken.instr: error during formatting' in reports[-1]
+
+    def test_mcfmt_negative_jobs(self, tmp_path, capsys):
+        """mcfmt rejects a negative -j with a usage error rather than a traceback."""
+        instr = tmp_path / 'test.instr'
+        instr.write_text('define instrument t()\ntrace\nend\n')
+        from mccode_antlr.cli.format import mcfmt
+        import sys
+        old_argv = sys.argv
+        try:
+            sys.argv = ['mcfmt', '-j', '-1', str(instr)]
+            with pytest.raises(SystemExit) as exc:
+                mcfmt()
+            assert exc.value.code == 2
+        finally:
+            sys.argv = old_argv
+        assert 'must be 0 or a positive integer' in capsys.readouterr().err
+
 
 
 # ---------------------------------------------------------------------------
@@ -400,7 +438,7 @@ class TestMakeClangFormatter:
         import unittest.mock as mock
 
         mock_result = mock.MagicMock()
-        mock_result.stdout = 'int x = 1;\n'
+        mock_result.stdout = b'int x = 1;\n'
         with mock.patch('shutil.which', return_value='/usr/bin/clang-format'), \
              mock.patch('subprocess.run', return_value=mock_result) as mock_run:
             fmt = make_clang_formatter(style='LLVM', fetch_mccode_config=False)
@@ -409,6 +447,20 @@ class TestMakeClangFormatter:
         mock_run.assert_called_once()
         assert output == 'int x = 1;\n'
 
+    def test_callable_normalises_line_endings(self):
+        """CRLF output from clang-format (e.g. on Windows) becomes plain newlines."""
+        from mccode_antlr.format import make_clang_formatter
+        import unittest.mock as mock
+
+        mock_result = mock.MagicMock()
+        mock_result.stdout = b'int x = 1;\r\nint y = 2;\r\n'
+        with mock.patch('shutil.which', return_value='/usr/bin/clang-format'), \
+             mock.patch('subprocess.run', return_value=mock_result):
+            fmt = make_clang_formatter(style='LLVM', fetch_mccode_config=False)
+            output = fmt('int x=1;\nint y=2;\n')
+
+        assert output == 'int x = 1;\nint y = 2;\n'
+
     def test_callable_falls_back_on_clang_format_error(self):
         """The callable returns unchanged content if clang-format fails."""
         from mccode_antlr.format import make_clang_formatter
@@ -486,7 +538,7 @@ class TestCLIClangFormatFlags:
         )
 
         mock_result = mock.MagicMock()
-        mock_result.stdout = '\nint x = 1;\n'
+        mock_result.stdout = b'\nint x = 1;\n'
 
         old_argv = sys.argv
         try:
@@ -0,0 +1,75 @@
+"""The two-stage SLL/LL parse must build the same trees and report the same errors as a plain LL parse."""
+import pytest
+from antlr4 import InputStream, CommonTokenStream
+from antlr4.error.ErrorListener import ErrorListener
+
+from mccode_antlr.grammar.McInstrLexer import McInstrLexer
+from mccode_antlr.grammar.McInstrParser import McInstrParser
+from mccode_antlr.grammar.mccode_parse import parse, pause_gc_while_parsing
+
+
+VALID = """DEFINE INSTRUMENT t(double x=1, int n=2, string s="a")
+DECLARE %{ double y; %}
+TRACE
+COMPONENT o = Arm() AT (0, 0, 0) ABSOLUTE
+COMPONENT a = Arm() WHEN (x > 0 && n < 3) AT (0, 0, x * 2) RELATIVE o ROTATED (0, n, 0) RELATIVE PREVIOUS
+COMPONENT b = COPY(a) AT (0, 0, -x) RELATIVE a
+END
+"""
+
+INVALID = [
+    "DEFINE INSTRUMENT t(double x=) TRACE END",
+    "DEFINE INSTRUMENT t() TRACE COMPONENT o = Arm() AT (0, 0) ABSOLUTE END",
+    "DEFINE INSTRUMENT t() TRACE COMPONENT o = Arm() AT (0, 0, 0) ABSOLUTE",
+]
+
+
+class Collect(ErrorListener):
+    def __init__(self):
+        self.errors = []
+
+    def syntaxError(self, recognizer, offendingSymbol, line, column, msg, e):
+        self.errors.append((line, column, msg))
+
+
+def _ll_parse(text, listener):
+    parser = McInstrParser(CommonTokenStream(McInstrLexer(InputStream(text))))
+    parser.removeErrorListeners()
+    parser.addErrorListener(listener)
+    return parser, parser.prog()
+
+
+def test_two_stage_parse_matches_ll():
+    parser, expected = _ll_parse(VALID, Collect())
+    tree = parse(McInstrLexer, McInstrParser, InputStream(VALID), 'prog')
+    assert tree.toStringTree(recog=parser) == expected.toStringTree(recog=parser)
+
+
+@pytest.mark.parametrize('text', INVALID)
+def test_two_stage_parse_reports_errors_once(text):
+    ours, theirs = Collect(), Collect()
+    tree = parse(McInstrLexer, McInstrParser, InputStream(text), 'prog', ours)
+    parser, expected = _ll_parse(text, theirs)
+    assert theirs.errors
+    assert ours.errors == theirs.errors
+    assert tree.toStringTree(recog=parser) == expected.toStringTree(recog=parser)
+
+
+class RecordingParser(McInstrParser):
+    gc_enabled = []
+
+    def prog(self):
+        import gc
+        self.gc_enabled.append(gc.isenabled())
+        return super().prog()
+
+
+def test_gc_paused_only_when_opted_in():
+    import gc
+    RecordingParser.gc_enabled.clear()
+    parse(McInstrLexer, RecordingParser, InputStream(VALID), 'prog')
+    with pause_gc_while_parsing():
+        parse(McInstrLexer, RecordingParser, InputStream(VALID), 'prog')
+        assert gc.isenabled()
+    assert RecordingParser.gc_enabled == [True, False]
+    assert gc.isenabled()
@@ -0,0 +1,200 @@
+"""The hand-written McDoc parser must build the same tree as the ANTLR-generated one."""
+import random
+
+import pytest
+from antlr4 import InputStream, TerminalNode
+from antlr4.error.ErrorListener import ErrorListener
+
+from mccode_antlr.grammar import McDoc_parse
+
+
+SAMPLE = """
+Component: Example
+
+%I
+Written by: Someone (someone@example.com)
+Date: 2024
+
+A short description
+
+%D
+A longer description
+spanning two lines.
+
+%P
+INPUT PARAMETERS:
+radius: [m]  Radius of the thing
+E0:     [meV] Mean energy
+flag: no unit given
+
+%L
+<a href="https://example.com">Example</a>
+%BUGS
+None known
+%E
+trailing text
+"""
+
+FRAGMENTS = ['%I\n', '%D\n', '%P\n', '%L\n', '%E\n', '%E', '%BUGS\n', '%VALIDATION  \n',
+             'text line', 'x: [m] thing', '\n', '\n\n', '   indented\n']
+
+LEXER_FRAGMENTS = FRAGMENTS + ['%ID \t\r\n', '%Info\n', '%End', '%Ends', '%ENDx', '%E \t', '%Ex\n',
+                               '\r\n', '\t', ' ', '100% sure', '%Parameters', '%', '%5', '\r', 'a\rb']
+
+
+def _token(token):
+    return (token.type, token.text, token.start, token.stop, token.line, token.column, token.channel,
+            token.tokenIndex)
+
+
+def _structure(node):
+    if isinstance(node, TerminalNode):
+        return node.symbol.type, node.symbol.text, node.symbol.tokenIndex
+    start = None if node.start is None else node.start.tokenIndex
+    stop = None if node.stop is None else node.stop.tokenIndex
+    children = tuple(_structure(child) for child in (node.children or ()))
+    parented = all(child.parentCtx is node for child in (node.children or ()))
+    return type(node).__name__, node.invokingState, start, stop, parented, children
+
+
+@pytest.fixture
+def fast_mcdoc():
+    """Set the ``fast_mcdoc`` configuration entry, restoring its value after the test"""
+    from mccode_antlr.config import config
+    saved = config['fast_mcdoc'].get()
+
+    def set_fast_mcdoc(value: bool):
+        config['fast_mcdoc'] = value
+
+    yield set_fast_mcdoc
+    config['fast_mcdoc'] = saved
+
+
+def _both(fast_mcdoc, text):
+    fast_mcdoc(True)
+    fast = McDoc_parse(InputStream(text), 'mcdoc')
+    fast_mcdoc(False)
+    slow = McDoc_parse(InputStream(text), 'mcdoc')
+    return fast, slow
+
+
+@pytest.mark.parametrize('text', ['', '\n', 'orphan', SAMPLE, SAMPLE.replace('\n', '\r\n')])
+def test_mcdoc_fast_parse_matches_generated(fast_mcdoc, text):
+    fast, slow = _both(fast_mcdoc, text)
+    assert _structure(fast) == _structure(slow)
+
+
+def test_mcdoc_fast_parse_matches_generated_random(fast_mcdoc):
+    rng = random.Random(8128)
+    for _ in range(200):
+        text = ''.join(rng.choice(FRAGMENTS) for _ in range(rng.randint(1, 30)))
+        fast, slow = _both(fast_mcdoc, text)
+        assert _structure(fast) == _structure(slow), repr(text)
+
+
+@pytest.mark.parametrize('rule', ['mcdoc', 'section', 'line'])
+def test_mcdoc_table_prediction_matches_generated(rule):
+    from mccode_antlr.grammar.McDocLexer import McDocLexer
+    from mccode_antlr.grammar.McDocParser import McDocParser
+    from mccode_antlr.grammar.mccode_parse import parse
+    from mccode_antlr.grammar.mcdoc_parse import _table_parser_class
+    rng = random.Random(496)
+    for _ in range(50):
+        text = ''.join(rng.choice(FRAGMENTS) for _ in range(rng.randint(1, 30)))
+        table = parse(McDocLexer, _table_parser_class(), InputStream(text), rule)
+        generated = parse(McDocLexer, McDocParser, InputStream(text), rule)
+        assert _structure(table) == _structure(generated), repr(text)
+
+
+def test_mcdoc_section_accessors_match_generated(fast_mcdoc):
+    fast, slow = _both(fast_mcdoc, SAMPLE + '%P\n')
+    for mine, theirs in zip(fast.section(), slow.section()):
+        if not (hasattr(theirs, 'line') and hasattr(theirs, 'NEWLINE')):
+            continue
+        for name in ('line', 'NEWLINE'):
+            mine_all, theirs_all = getattr(mine, name)(), getattr(theirs, name)()
+            assert [_structure(x) for x in mine_all] == [_structure(x) for x in theirs_all]
+            for i in (-1, 0, 1, len(theirs_all)):
+                a, b = getattr(mine, name)(i), getattr(theirs, name)(i)
+                assert (a is None and b is None) or _structure(a) == _structure(b)
+        for mine_line, their_line in zip(mine.line(), theirs.line()):
+            for name in ('LINE', 'NEWLINE'):
+                a, b = getattr(mine_line, name)(), getattr(their_line, name)()
+                assert (a is None and b is None) or _structure(a) == _structure(b)
+
+
+def test_mcdoc_regex_lexer_matches_generated():
+    from antlr4 import CommonTokenStream
+    from mccode_antlr.grammar.McDocLexer import McDocLexer
+    from mccode_antlr.grammar.mcdoc_parse import _lex_mcdoc
+
+    class Errors(ErrorListener):
+        def syntaxError(self, *args):
+            raise ValueError
+
+    rng = random.Random(1729)
+    lexed = 0
+    for _ in range(500):
+        text = ''.join(rng.choice(LEXER_FRAGMENTS) for _ in range(rng.randint(0, 12)))
+        lexer = McDocLexer(InputStream(text))
+        lexer.removeErrorListeners()
+        lexer.addErrorListener(Errors())
+        tokens = CommonTokenStream(lexer)
+        try:
+            tokens.fill()
+        except ValueError:
+            assert _lex_mcdoc(InputStream(text)) is None, repr(text)
+            continue
+        mine = _lex_mcdoc(InputStream(text))
+        assert mine is not None, repr(text)
+        assert [_token(t) for t in mine] == [_token(t) for t in tokens.tokens], repr(text)
+        lexed += 1
+    assert lexed > 100
+
+
+def test_mcdoc_extractors_match_generated(fast_mcdoc):
+    from mccode_antlr.mcdoc.visitor import McDocExtractVisitor, McDocFullExtractor
+    fast, slow = _both(fast_mcdoc, SAMPLE)
+    extracted = []
+    for tree in (fast, slow):
+        params, full = McDocExtractVisitor(), McDocFullExtractor()
+        params.visit(tree)
+        full.visit(tree)
+        extracted.append((params.parameters, vars(full)))
+    assert extracted[0] == extracted[1]
+    assert extracted[0][0]['E0'] == ('meV', 'Mean energy')
+
+
+@pytest.mark.parametrize('fast', [True, False])
+def test_mcdoc_sections_match_tree_extraction(fast_mcdoc, fast):
+    from mccode_antlr.grammar.mcdoc_parse import mcdoc_sections
+    from mccode_antlr.mcdoc.visitor import McDocFullExtractor
+    fast_mcdoc(fast)
+    rng = random.Random(31)
+    # the unknown '%5' tag is a lexer error, which the fast path hands to the ANTLR lexer
+    texts = [SAMPLE, '%I\nWritten by: x\n%5 y\n%L\nlink\n']
+    texts += [''.join(rng.choice(FRAGMENTS) for _ in range(rng.randint(0, 20))) for _ in range(100)]
+    for text in texts:
+        streamed, visited = McDocFullExtractor(), McDocFullExtractor()
+        for tag, lines in mcdoc_sections(text):
+            streamed.add_section(tag, lines)
+        visited.visit(McDoc_parse(InputStream(text), 'mcdoc'))
+        assert vars(streamed) == vars(visited), repr(text)
+
+
+def test_mcdoc_atn_matches_hardcoded_states():
+    # A regenerated McDocParser silently disables the fast path; update the states and digest together
+    from mccode_antlr.grammar import mcdoc_parse
+    assert mcdoc_parse._MCDOC_ATN_MATCHES
+
+
+def test_mcdoc_changed_atn_uses_generated_parser(monkeypatch, fast_mcdoc):
+    from mccode_antlr.grammar import mcdoc_parse
+    monkeypatch.setattr(mcdoc_parse, '_MCDOC_ATN_MATCHES', False)
+    fast_mcdoc(True)
+    assert not mcdoc_parse._fast_mcdoc_enabled()
+    # the hand-written scanner and table parser build their own LineContext subclass
+    generated = mcdoc_parse.McDocParser.LineContext
+    sections = McDoc_parse(InputStream(SAMPLE), 'mcdoc').section()
+    lines = [line for section in sections for line in section.getTypedRuleContexts(generated)]
+    assert lines and all(type(line) is generated for line in lines)